@@ -0,0 +1,328 @@
+"""Synthetic provider API for benchmarks.
+
+`make_api_cls` produces a `BaseEnergosbytAPI` subclass which serves N accounts,
+each with M multi-zone meters and K invoices / payments, with configurable
+latency per request. Requests are counted per endpoint in `API.calls`.
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from os import path
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Tuple, Type
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from inter_rao_energosbyt.actions.sql.byt import LSInfo  # noqa: E402
+from inter_rao_energosbyt.actions.sql.ls_management import LSList  # noqa: E402
+from inter_rao_energosbyt.interfaces import (  # noqa: E402
+    AbstractAccountWithBalance,
+    AbstractAccountWithInvoices,
+    AbstractAccountWithMeters,
+    AbstractAccountWithPayments,
+    AbstractBalance,
+    AbstractInvoice,
+    AbstractMeterZone,
+    AbstractPayment,
+    AbstractSubmittableMeter,
+    BaseEnergosbytAPI,
+)
+from inter_rao_energosbyt.presets.byt import (
+    AccountWithBytInfo,
+    BytInfoSingle,
+)  # noqa: E402
+
+ZONE_NAMES = ("День", "Ночь", "Пик", "Полупик")
+TODAY = date.today()
+
+
+class SyntheticBalance(AbstractBalance):
+    __slots__ = ("_account", "_balance", "_timestamp")
+
+    def __init__(self, account: "SyntheticAccount", balance: float) -> None:
+        self._account = account
+        self._balance = balance
+        self._timestamp = datetime.now(timezone.utc)
+
+    account = property(lambda self: self._account)
+    balance = property(lambda self: self._balance)
+    timestamp = property(lambda self: self._timestamp)
+
+
+class SyntheticInvoice(AbstractInvoice):
+    __slots__ = ("_account", "_period", "_total")
+
+    def __init__(self, account: "SyntheticAccount", period: date, total: float) -> None:
+        self._account = account
+        self._period = period
+        self._total = total
+
+    account = property(lambda self: self._account)
+    period = property(lambda self: self._period)
+    total = property(lambda self: self._total)
+    paid = property(lambda self: round(self._total * 0.9, 2))
+    initial = property(lambda self: 120.5)
+    charged = property(lambda self: round(self._total - 120.5, 2))
+    insurance = property(lambda self: 25.0)
+    benefits = property(lambda self: -10.0)
+    penalty = property(lambda self: 1.5)
+    service = property(lambda self: 35.0)
+    recalculations = property(lambda self: -3.25)
+
+
+class SyntheticPayment(AbstractPayment):
+    __slots__ = ("_account", "_paid_at", "_amount")
+
+    def __init__(
+        self, account: "SyntheticAccount", paid_at: datetime, amount: float
+    ) -> None:
+        self._account = account
+        self._paid_at = paid_at
+        self._amount = amount
+
+    account = property(lambda self: self._account)
+    paid_at = property(lambda self: self._paid_at)
+    amount = property(lambda self: self._amount)
+    agent = property(lambda self: "Сбербанк Онлайн")
+    group_id = property(lambda self: "payments")
+
+
+class SyntheticMeterZone(AbstractMeterZone):
+    __slots__ = ("_name", "_last_indication")
+
+    def __init__(self, name: str, last_indication: float) -> None:
+        self._name = name
+        self._last_indication = last_indication
+
+    name = property(lambda self: self._name)
+    last_indication = property(lambda self: self._last_indication)
+
+
+class SyntheticMeter(AbstractSubmittableMeter):
+    __slots__ = ("_account", "_index", "_zones")
+
+    def __init__(
+        self, account: "SyntheticAccount", index: int, zone_count: int
+    ) -> None:
+        self._account = account
+        self._index = index
+        self._zones = {
+            f"t{zone + 1}": SyntheticMeterZone(
+                ZONE_NAMES[zone % len(ZONE_NAMES)], 1000.0 * (index + 1) + zone * 123.4
+            )
+            for zone in range(zone_count)
+        }
+
+    account = property(lambda self: self._account)
+    id = property(lambda self: f"{self._account.code}{self._index:03d}")
+    zones = property(lambda self: self._zones)
+    model = property(lambda self: "Меркурий 200.02")
+    installation_date = property(lambda self: date(2015, 3, 1))
+    last_indications_date = property(lambda self: TODAY - timedelta(days=3))
+    submission_period = property(
+        lambda self: (TODAY.replace(day=1), TODAY.replace(day=1) + timedelta(days=24))
+    )
+
+    async def _internal_async_submit_indications(self, **kwargs) -> Any:
+        await self._account.api.async_synthetic_request("submit_indications")
+
+
+class SyntheticAccount(
+    AbstractAccountWithBalance,
+    AbstractAccountWithMeters,
+    AbstractAccountWithInvoices,
+    AbstractAccountWithPayments,
+    AccountWithBytInfo,
+):
+    __slots__ = ("_info",)
+
+    timezone = timezone(timedelta(hours=3))
+
+    def __init__(self, api: "SyntheticAPI", data: LSList) -> None:
+        super().__init__(api, data)
+        self._info: Optional[BytInfoSingle] = None
+
+    # Byt info
+
+    byt_plugin_proxy = property(lambda self: "bytProxy")
+    byt_plugin_provider = property(lambda self: "{}")
+
+    async def async_update_byt_preset_parameters(self) -> Tuple[str, str]:
+        return self.byt_plugin_proxy, self.byt_plugin_provider
+
+    @property
+    def info(self) -> Optional[BytInfoSingle]:
+        return self._info
+
+    async def async_get_info(self) -> BytInfoSingle:
+        await self.api.async_synthetic_request("info")
+        return BytInfoSingle(make_ls_info(self.api.zone_count))
+
+    async def async_update_info(self) -> BytInfoSingle:
+        self._info = await self.async_get_info()
+        return self._info
+
+    # Data endpoints
+
+    async def async_update_related(self) -> None:
+        await self.api.async_synthetic_request("update_related")
+
+    async def async_get_balance(self) -> SyntheticBalance:
+        await self.api.async_synthetic_request("balance")
+        return SyntheticBalance(self, -1234.56)
+
+    async def async_get_meters(self) -> Mapping[str, SyntheticMeter]:
+        await self.api.async_synthetic_request("meters")
+        api = self.api
+        meters = (
+            SyntheticMeter(self, index, api.zone_count)
+            for index in range(api.meter_count)
+        )
+        return {meter.id: meter for meter in meters}
+
+    async def async_get_invoices(self, start=None, end=None) -> List[SyntheticInvoice]:
+        await self.api.async_synthetic_request("invoices")
+        invoices = []
+        period = TODAY.replace(day=1)
+        for index in range(self.api.invoice_count):
+            invoices.append(SyntheticInvoice(self, period, 1500.0 + index))
+            period = (period - timedelta(days=1)).replace(day=1)
+        return _filter_dated(invoices, "period", start, end)
+
+    async def async_get_payments(self, start=None, end=None) -> List[SyntheticPayment]:
+        await self.api.async_synthetic_request("payments")
+        payments = []
+        paid_at = datetime.combine(
+            TODAY.replace(day=5), datetime.min.time(), self.timezone
+        )
+        for index in range(self.api.invoice_count):
+            payments.append(SyntheticPayment(self, paid_at, 1400.0 + index))
+            paid_at = (paid_at - timedelta(days=25)).replace(day=5)
+        return _filter_dated(payments, "paid_at", start, end)
+
+
+def _filter_dated(items: List[Any], attribute: str, start: Any, end: Any) -> List[Any]:
+    def _as_date(value: Any) -> Optional[date]:
+        return value.date() if isinstance(value, datetime) else value
+
+    start, end = _as_date(start), _as_date(end)
+    return [
+        item
+        for item in items
+        if (start is None or start <= _as_date(getattr(item, attribute)))
+        and (end is None or _as_date(getattr(item, attribute)) <= end)
+    ]
+
+
+def make_ls_list(index: int) -> LSList:
+    return LSList.from_response(
+        {
+            "data": {
+                "KD_LS_OWNER_TYPE": 1,
+                "nm_street": f"г. Москва, ул. Тестовая, д. {index}",
+            },
+            "id_service": 100000 + index,
+            "kd_provider": 1,
+            "kd_service_type": 1,
+            "kd_status": 1,
+            "nm_ls_description": f"Квартира {index}",
+            "nm_ls_group": "Электроэнергия",
+            "nm_ls_group_full": "Электроэнергия (МЭС)",
+            "nm_provider": "АО «Мосэнергосбыт»",
+            "nm_type": "Электроснабжение",
+            "nn_ls": f"{9900000000 + index}",
+            "pr_ls_group_edit": True,
+            "vl_provider": "{}",
+        }
+    )
+
+
+def make_ls_info(zone_count: int) -> LSInfo:
+    data = {
+        "nm_addr": "г. Москва, ул. Тестовая, д. 1, кв. 1",
+        "nm_askue": "Нет",
+        "nm_fio": "Иванов Иван Иванович",
+        "nm_hou": "Многоквартирный дом",
+        "nm_meter_category": "Однофазный",
+        "nm_pstove": "Электроплита",
+        "nn_meter": "12345678",
+        "pr_communal": False,
+        "tp_hou": 1,
+        "vl_living_area": 42.5,
+        "vl_person": 3,
+        "vl_total_area": 61.2,
+    }
+    for zone in range(1, min(zone_count, 3) + 1):
+        data[f"nm_t{zone}"] = ZONE_NAMES[zone - 1]
+        data[f"nm_t{zone}_description"] = f"Тарифная зона {zone}"
+        data[f"vl_t{zone}_tariff"] = 5.0 + zone
+    return LSInfo.from_response(data)
+
+
+class SyntheticAPI(BaseEnergosbytAPI):
+    BASE_URL = "https://synthetic.invalid"
+    AUTH_URL = BASE_URL + "/auth"
+    REQUEST_URL = BASE_URL + "/request"
+    APP_VERSION = "1"
+    ACCOUNT_URL = BASE_URL + "/account"
+    LOGIN_TYPE = 1
+
+    __slots__ = ()
+
+    account_count: ClassVar[int] = 1
+    meter_count: ClassVar[int] = 1
+    zone_count: ClassVar[int] = 2
+    invoice_count: ClassVar[int] = 12
+    latency: ClassVar[float] = 0.0
+    calls: ClassVar[Counter] = Counter()
+
+    async def async_synthetic_request(self, endpoint: str) -> None:
+        self.calls[endpoint] += 1
+        await asyncio.sleep(self.latency)
+
+    async def async_authenticate(self) -> None:
+        await self.async_synthetic_request("authenticate")
+        self.auth_session = type(
+            "AuthSession", (), {"is_success": True, "id_profile": id(self)}
+        )()
+
+    async def async_update_accounts(
+        self, skip_errors: bool = True, with_related: bool = True, disable: Any = None
+    ) -> Dict[int, SyntheticAccount]:
+        await self.async_synthetic_request("accounts")
+
+        accounts = self._accounts or {}
+        for index in range(self.account_count):
+            data = make_ls_list(index)
+            if data.id_service in accounts:
+                accounts[data.id_service].data = data
+            else:
+                accounts[data.id_service] = SyntheticAccount(self, data)
+        self._accounts = accounts
+
+        if with_related:
+            await asyncio.gather(
+                *(account.async_update_related() for account in accounts.values())
+            )
+
+        return dict(accounts)
+
+
+def make_api_cls(
+    accounts: int, meters: int, zones: int, invoices: int, latency: float
+) -> Type[SyntheticAPI]:
+    """Create API class with its own data dimensions and request counter"""
+    return type(
+        "SyntheticAPI",
+        (SyntheticAPI,),
+        {
+            "__slots__": (),
+            "account_count": accounts,
+            "meter_count": meters,
+            "zone_count": zones,
+            "invoice_count": invoices,
+            "latency": latency,
+            "calls": Counter(),
+        },
+    )
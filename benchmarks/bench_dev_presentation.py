@@ -0,0 +1,96 @@
+"""Micro-benchmark of value masking for `dev_presentation` mode.
+
+Usage: python benchmarks/bench_dev_presentation.py [values per run]
+
+Values are shaped after the masked entity attributes and name variables:
+account codes and IDs, meter codes, addresses and descriptions. The compiled
+masker is measured both cold (cache cleared before every run) and warm, the
+latter being the case for values that persist between updates.
+"""
+
+import random
+import re
+import sys
+import timeit
+from os import path
+from typing import Callable, List
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from custom_components.lkcomu_interrao._util import mask_dev_presentation  # noqa: E402
+
+REPEAT = 200
+
+
+def legacy_mask_dev_presentation(value: str) -> str:
+    """Reference implementation (three uncompiled substitutions)"""
+    value = re.sub(r"[A-Za-z]", "X", value)
+    value = re.sub(r"[0-9]", "#", value)
+    value = re.sub(r"\w+", "*", value)
+    return value
+
+
+def make_values(count: int = 500, seed: int = 0) -> List[str]:
+    rnd = random.Random(seed)
+    streets = ("Тестовая", "Ленина", "Profsoyuznaya", "Мира", "Садовая-Кудринская")
+    values = []
+    while len(values) < count:
+        kind = rnd.randrange(5)
+        if kind == 0:
+            values.append("%010d" % rnd.randrange(10**10))
+        elif kind == 1:
+            values.append(str(rnd.randrange(10**5, 10**7)))
+        elif kind == 2:
+            values.append(
+                "%08d-%s" % (rnd.randrange(10**8), rnd.choice(("A", "Т1", "b2")))
+            )
+        elif kind == 3:
+            values.append(
+                "г. Москва, ул. %s, д. %d, кв. %d"
+                % (rnd.choice(streets), rnd.randrange(1, 200), rnd.randrange(1, 500))
+            )
+        else:
+            values.append(
+                "Квартира %d (flat_%d)" % (rnd.randrange(100), rnd.randrange(100))
+            )
+    return values
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    values = make_values(count)
+
+    assert list(map(mask_dev_presentation, values)) == list(
+        map(legacy_mask_dev_presentation, values)
+    )
+
+    def _run_cold() -> None:
+        mask_dev_presentation.cache_clear()
+        for value in values:
+            mask_dev_presentation(value)
+
+    def _run(func: Callable[[str], str]) -> Callable[[], None]:
+        def _run_values() -> None:
+            for value in values:
+                func(value)
+
+        return _run_values
+
+    print(f"Values: {len(values)}, {REPEAT} runs")
+    baseline = None
+    for name, run in (
+        ("legacy", _run(legacy_mask_dev_presentation)),
+        ("compiled", _run(mask_dev_presentation.__wrapped__)),
+        ("cold cache", _run_cold),
+        ("warm cache", _run(mask_dev_presentation)),
+    ):
+        elapsed = timeit.timeit(run, number=REPEAT) / REPEAT / len(values)
+        if baseline is None:
+            baseline = elapsed
+        print(
+            f"{name:>12}: {elapsed * 1e6:.3f} us per value ({baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Micro-benchmarks of entity properties evaluated on every state write.
+
+Usage: python benchmarks/bench_entities.py [--rounds N] [--json out.json]
+                                            [--compare base.json]
+
+Entities are built over synthetic provider data (see `_synthetic.py`): an account
+with byt info and three tariff zones, a four-zone meter and an invoice with every
+field filled. Every case runs with and without `dev_presentation`.
+
+Timing follows pytest-benchmark: iterations per round are calibrated so that a
+round lasts at least `--min-time`, and statistics are reported per call. With
+`--compare`, medians are checked against a previously saved JSON file, and the
+script exits with non-zero status when any case regressed by more than
+`--max-regression` percent.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from os import path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+from _synthetic import make_api_cls  # noqa: E402
+from custom_components.lkcomu_interrao._schema import (
+    GENERIC_ACCOUNT_SCHEMA,
+)  # noqa: E402
+from custom_components.lkcomu_interrao.const import CONF_DEV_PRESENTATION  # noqa: E402
+from custom_components.lkcomu_interrao.sensor import (  # noqa: E402
+    LkcomuAccount,
+    LkcomuLastInvoice,
+    LkcomuMeter,
+)
+
+Case = Tuple[str, Callable[[], Any]]
+
+
+def calibrate(func: Callable[[], Any], min_time: float) -> int:
+    iterations = 1
+    while True:
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        if time.perf_counter() - started_at >= min_time:
+            return iterations
+        iterations *= 2
+
+
+def run_case(func: Callable[[], Any], rounds: int, min_time: float) -> Dict[str, Any]:
+    iterations = calibrate(func, min_time)
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - started_at) / iterations)
+
+    mean = statistics.fmean(timings)
+    return {
+        "min": min(timings),
+        "max": max(timings),
+        "mean": mean,
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "median": statistics.median(timings),
+        "ops": 1 / mean,
+        "rounds": rounds,
+        "iterations": iterations,
+    }
+
+
+async def async_make_cases(zones: int, invoices: int) -> List[Case]:
+    api_cls = make_api_cls(
+        accounts=1, meters=1, zones=zones, invoices=invoices, latency=0.0
+    )
+    api = api_cls(username="benchmark@example.com", password="-")
+    await api.async_authenticate()
+    try:
+        account = next(iter((await api.async_update_accounts()).values()))
+        await account.async_update_info()
+        balance = await account.async_get_balance()
+        meter = next(iter((await account.async_get_meters()).values()))
+        last_invoice = await account.async_get_last_invoice()
+    finally:
+        await api.async_close()
+
+    cases: List[Case] = []
+    for dev_presentation in (False, True):
+        account_config = GENERIC_ACCOUNT_SCHEMA(
+            {CONF_DEV_PRESENTATION: dev_presentation}
+        )
+        suffix = "[dev_presentation]" if dev_presentation else ""
+
+        entities = (
+            ("LkcomuAccount", LkcomuAccount(account, account_config, balance=balance)),
+            ("LkcomuMeter", LkcomuMeter(account, account_config, meter=meter)),
+            (
+                "LkcomuLastInvoice",
+                LkcomuLastInvoice(account, account_config, last_invoice=last_invoice),
+            ),
+        )
+        for entity_name, entity in entities:
+            for prop in ("name", "extra_state_attributes", "sensor_related_attributes"):
+                getter = getattr(type(entity), prop).fget
+                cases.append(
+                    (
+                        f"{entity_name}.{prop}{suffix}",
+                        lambda getter=getter, entity=entity: getter(entity),
+                    )
+                )
+            # Attributes are served from cache between updates; cost of a refill
+            cases.append(
+                (
+                    f"{entity_name}._compute_extra_state_attributes{suffix}",
+                    entity._compute_extra_state_attributes,
+                )
+            )
+
+    return cases
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], max_regression: float
+) -> List[str]:
+    regressions = []
+    for name, stats in results.items():
+        base_stats = baseline.get("cases", {}).get(name)
+        if base_stats is None:
+            continue
+        change = stats["median"] / base_stats["median"] - 1
+        stats["change"] = change
+        if change * 100 > max_regression:
+            regressions.append(name)
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    name_width = max(map(len, results))
+    print(
+        f"{'Name (time in us)':<{name_width}} {'Min':>9} {'Median':>9} {'Mean':>9} "
+        f"{'StdDev':>9} {'OPS (Kops/s)':>13} {'Change':>8}"
+    )
+    for name, stats in results.items():
+        change = stats.get("change")
+        print(
+            f"{name:<{name_width}} {stats['min'] * 1e6:>9.2f} "
+            f"{stats['median'] * 1e6:>9.2f} {stats['mean'] * 1e6:>9.2f} "
+            f"{stats['stddev'] * 1e6:>9.2f} "
+            f"{stats['ops'] / 1000:>13.2f} "
+            f"{'' if change is None else format(change, '+.1%'):>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument(
+        "--min-time", type=float, default=0.005, help="min round time (s)"
+    )
+    parser.add_argument("--zones", type=int, default=4, help="tariff zones per meter")
+    parser.add_argument("--invoices", type=int, default=24, help="invoices per account")
+    parser.add_argument("-k", dest="filter", help="run only cases containing substring")
+    parser.add_argument("--json", help="save results to file")
+    parser.add_argument("--compare", help="compare against results saved earlier")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="percent")
+    args = parser.parse_args(argv)
+
+    cases = asyncio.run(async_make_cases(args.zones, args.invoices))
+    results = {
+        name: run_case(func, args.rounds, args.min_time)
+        for name, func in cases
+        if not args.filter or args.filter in name
+    }
+
+    regressions: List[str] = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "entities", "cases": results}, f, indent=2)
+            f.write("\n")
+
+    if regressions:
+        print(
+            f"\nRegressed by more than {args.max_regression}%: {', '.join(regressions)}"
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
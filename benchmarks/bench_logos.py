@@ -0,0 +1,80 @@
+"""Micro-benchmark of provider logo discovery over frontend asset manifest.
+
+Usage: python benchmarks/bench_logos.py [path/to/asset-manifest.json]
+
+Without arguments, the manifest fixture in `benchmarks/fixtures` is used. It has
+the flat layout the integration parses (asset names mapped to content-hashed paths
+relative to base URL, including `main.js`): chunks, source maps, static media, and
+logo and marker images for all provider codes. Pass a manifest downloaded from
+`<base URL>/asset-manifest.json` to measure against a live frontend instead.
+
+The manifest is passed to `find_provider_logos` as loaded, exactly as it is by
+`ProviderLogosCache`.
+"""
+
+import json
+import sys
+import timeit
+from os import path
+from typing import Any, Dict, Mapping
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from custom_components.lkcomu_interrao._util import (  # noqa: E402
+    _PROVIDER_CODES,
+    _make_code_search_index,
+    find_provider_logos,
+)
+
+REPEAT = 200
+MANIFEST_FIXTURE = path.join(
+    path.dirname(path.abspath(__file__)), "fixtures", "asset-manifest.json"
+)
+
+
+def legacy_find_provider_logos(manifest: Mapping[str, Any]) -> Dict[str, str]:
+    """Reference implementation (per-code scan over manifest)"""
+    icons = {}
+    for code in _PROVIDER_CODES:
+        search_index = _make_code_search_index(code)
+        if "_" in code:
+            root_code = code.split("_")[0]
+            search_index = (*search_index, *_make_code_search_index(root_code))
+        for key in manifest:
+            lower_key = key.lower()
+            for index_key in search_index:
+                if index_key in lower_key:
+                    icons[code] = manifest[key]
+                    break
+
+            if (
+                code not in icons
+                and code in key
+                and (
+                    lower_key.endswith(".png")
+                    or lower_key.endswith(".jpg")
+                    or lower_key.endswith(".svg")
+                )
+            ):
+                icons[code] = manifest[key]
+    return icons
+
+
+def main() -> None:
+    source = sys.argv[1] if len(sys.argv) > 1 else MANIFEST_FIXTURE
+    with open(source, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    assert find_provider_logos(manifest) == legacy_find_provider_logos(manifest)
+
+    print(f"Manifest: {path.basename(source)} ({len(manifest)} keys), {REPEAT} runs")
+    for name, func in (
+        ("legacy", legacy_find_provider_logos),
+        ("single-pass", find_provider_logos),
+    ):
+        elapsed = timeit.timeit(lambda: func(manifest), number=REPEAT)
+        print(f"{name:>12}: {elapsed / REPEAT * 1000:.3f} ms per manifest")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Benchmark of config entry setup and data refresh against a synthetic provider.
+
+Usage: python benchmarks/bench_refresh.py [--accounts N] [--meters M] [--invoices K] ...
+
+A test Home Assistant instance (from `pytest-homeassistant-custom-component`) sets
+up a config entry through the regular integration code paths: the setup entry
+procedure of each platform, `async_refresh_api_data` and the group updaters of
+the coordinator. Only the provider API (see `_synthetic.py`) and logo retrieval
+are replaced. Every phase reports wall time, requests per endpoint, peak traced
+memory and event loop blocking as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from os import path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+# Test harness goes first, as it imports HA core in the order loader relies upon
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from homeassistant import loader  # noqa: E402
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+
+from _synthetic import SyntheticAPI, make_api_cls  # noqa: E402
+from custom_components.lkcomu_interrao import _base, _util  # noqa: E402
+from custom_components.lkcomu_interrao._base import async_refresh_api_data  # noqa: E402
+from custom_components.lkcomu_interrao.const import (  # noqa: E402
+    DATA_API_OBJECTS,
+    DATA_UPDATE_COORDINATORS,
+    DOMAIN,
+)
+
+BLOCK_THRESHOLD = 0.01  # seconds
+
+
+class LoopBlockMonitor:
+    """Time spent by the event loop in callbacks (i.e. not waiting for I/O)"""
+
+    def __init__(self, threshold: float = BLOCK_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.blocks = 0
+        self.max_block = 0.0
+
+    @contextmanager
+    def watch(self) -> Iterator["LoopBlockMonitor"]:
+        original_run = asyncio.events.Handle._run
+        monitor = self
+
+        def _run(handle: asyncio.Handle) -> None:
+            started_at = time.perf_counter()
+            try:
+                original_run(handle)
+            finally:
+                elapsed = time.perf_counter() - started_at
+                monitor.busy += elapsed
+                if elapsed > monitor.max_block:
+                    monitor.max_block = elapsed
+                if elapsed >= monitor.threshold:
+                    monitor.blocked += elapsed
+                    monitor.blocks += 1
+
+        asyncio.events.Handle._run = _run
+        try:
+            yield self
+        finally:
+            asyncio.events.Handle._run = original_run
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "busy_s": round(self.busy, 6),
+            "blocked_s": round(self.blocked, 6),
+            "blocks": self.blocks,
+            "max_block_ms": round(self.max_block * 1000, 3),
+            "block_threshold_ms": self.threshold * 1000,
+        }
+
+
+async def measure_phase(
+    api_cls: "type[SyntheticAPI]",
+    async_phase: Callable[[], Awaitable[Any]],
+    trace_memory: bool,
+) -> Dict[str, Any]:
+    api_cls.calls.clear()
+    monitor = LoopBlockMonitor()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    with monitor.watch():
+        started_at = time.perf_counter()
+        await async_phase()
+        wall_time = time.perf_counter() - started_at
+
+    result = {
+        "wall_time_s": round(wall_time, 6),
+        "requests": dict(sorted(api_cls.calls.items())),
+        "requests_total": sum(api_cls.calls.values()),
+        "loop": monitor.as_dict(),
+    }
+
+    if trace_memory:
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    wall_times = sorted(run["wall_time_s"] for run in runs)
+    summary = dict(runs[-1])
+    summary["wall_time_s"] = {
+        "min": wall_times[0],
+        "median": wall_times[len(wall_times) // 2],
+        "max": wall_times[-1],
+        "runs": wall_times,
+    }
+    if "peak_memory_bytes" in runs[0]:
+        summary["peak_memory_bytes"] = max(run["peak_memory_bytes"] for run in runs)
+    summary["loop"]["max_block_ms"] = max(run["loop"]["max_block_ms"] for run in runs)
+    return summary
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    api_cls = make_api_cls(
+        accounts=args.accounts,
+        meters=args.meters,
+        zones=args.zones,
+        invoices=args.invoices,
+        latency=args.latency / 1000,
+    )
+
+    entry_data = {
+        "type": "moscow",
+        "username": "benchmark@example.com",
+        "password": "-",
+    }
+    if args.cache_ttl is not None:
+        entry_data["cache_ttl"] = args.cache_ttl
+
+    phases: Dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        async with async_test_home_assistant(storage_dir=storage_dir) as hass:
+            # Enable loading of custom integrations
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+
+            with (
+                patch(
+                    "custom_components.lkcomu_interrao.import_api_cls",
+                    return_value=api_cls,
+                ),
+                patch.object(_base, "async_get_icons_for_providers", return_value={}),
+            ):
+                entry = MockConfigEntry(domain=DOMAIN, data=entry_data)
+                entry.add_to_hass(hass)
+
+                async def _async_setup() -> None:
+                    assert await hass.config_entries.async_setup(entry.entry_id)
+                    await hass.async_block_till_done()
+
+                phases["setup"] = await measure_phase(
+                    api_cls, _async_setup, args.trace_memory
+                )
+                entity_count = len(hass.states.async_entity_ids())
+
+                api = hass.data[DATA_API_OBJECTS][entry.entry_id]
+                coordinator = hass.data[DATA_UPDATE_COORDINATORS][entry.entry_id]
+
+                def _reset_caches() -> None:
+                    if args.cold:
+                        _util._SINGLE_FLIGHT_CALLS.clear()
+                        for account in (api.accounts or {}).values():
+                            _util.invalidate_account_cache(account)
+
+                async def _async_refresh() -> None:
+                    _reset_caches()
+                    await async_refresh_api_data(hass, entry)
+                    await hass.async_block_till_done()
+
+                async def _async_update_groups() -> None:
+                    _reset_caches()
+                    await asyncio.gather(
+                        *(
+                            coordinator.async_refresh_group(key)
+                            for key in list(coordinator._groups)
+                        )
+                    )
+                    await hass.async_block_till_done()
+
+                for name, async_phase in (
+                    ("refresh_api_data", _async_refresh),
+                    ("update_groups", _async_update_groups),
+                ):
+                    phases[name] = summarize(
+                        [
+                            await measure_phase(api_cls, async_phase, args.trace_memory)
+                            for _ in range(args.repeat)
+                        ]
+                    )
+
+                async def _async_unload() -> None:
+                    assert await hass.config_entries.async_unload(entry.entry_id)
+                    await hass.async_block_till_done()
+
+                phases["unload"] = await measure_phase(
+                    api_cls, _async_unload, args.trace_memory
+                )
+
+    return {
+        "benchmark": "refresh",
+        "parameters": {
+            "accounts": args.accounts,
+            "meters": args.meters,
+            "zones": args.zones,
+            "invoices": args.invoices,
+            "latency_ms": args.latency,
+            "repeat": args.repeat,
+            "cold": args.cold,
+            "cache_ttl": args.cache_ttl,
+            "trace_memory": args.trace_memory,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+        },
+        "entities": entity_count,
+        "phases": phases,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--meters", type=int, default=2, help="meters per account")
+    parser.add_argument("--zones", type=int, default=3, help="tariff zones per meter")
+    parser.add_argument(
+        "--invoices", type=int, default=24, help="invoices (and payments) per account"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=50.0, help="request latency (ms)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs of repeated phases")
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="drop shared and cached results between runs",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=None,
+        help="response cache TTL (seconds) for all endpoints",
+    )
+    parser.add_argument(
+        "--no-trace-memory",
+        dest="trace_memory",
+        action="store_false",
+        help="skip memory tracing (it slows down execution)",
+    )
+    parser.add_argument("--output", "-o", help="write JSON to file instead of stdout")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level)
+
+    result = asyncio.run(run_benchmark(args))
+
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 """Energosbyt API"""
+
 __all__ = (
     "CONFIG_SCHEMA",
     "async_unload_entry",
     "async_reload_entry",
+    "async_remove_entry",
     "async_setup",
     "async_setup_entry",
+    "async_dump_trace",
     "config_flow",
     "const",
     "sensor",
@@ -13,41 +16,83 @@ __all__ = (
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Mapping, Optional, TYPE_CHECKING, Tuple
+from typing import Any, Dict, Final, List, Mapping, Optional, TYPE_CHECKING, Tuple
 
+import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import CONF_PASSWORD, CONF_TYPE, CONF_USERNAME
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 
-from custom_components.lkcomu_interrao._base import UpdateDelegatorsDataType
+from custom_components.lkcomu_interrao._base import (
+    UpdateDelegatorsDataType,
+    async_refresh_api_data,
+    async_release_host_limiter,
+)
+from custom_components.lkcomu_interrao._coordinator import LkcomuInterRAOCoordinator
+from custom_components.lkcomu_interrao._metrics import (
+    EntryMetrics,
+    LkcomuInterRAOMetricsView,
+)
+from custom_components.lkcomu_interrao._pool import (
+    async_get_connection_pool,
+    async_release_connection_pool,
+)
 from custom_components.lkcomu_interrao._schema import CONFIG_ENTRY_SCHEMA
+from custom_components.lkcomu_interrao._snapshot import EntrySnapshot
+from custom_components.lkcomu_interrao._state import (
+    ApiState,
+    async_release_api_state,
+    async_setup_api_state,
+)
+from custom_components.lkcomu_interrao._tracing import (
+    SpanRecorder,
+    make_trace_events,
+    save_trace_events,
+)
 from custom_components.lkcomu_interrao._util import (
     IS_IN_RUSSIA,
     _find_existing_entry,
     _make_log_prefix,
     async_get_icons_for_providers,
+    configure_response_cache,
     import_api_cls,
     mask_username,
 )
 from custom_components.lkcomu_interrao.const import (
     API_TYPE_DEFAULT,
     API_TYPE_NAMES,
+    ATTR_PATH,
     CONF_ACCOUNTS,
+    CONF_BACKGROUND_SETUP,
+    CONF_CACHE_TTL,
     CONF_LAST_INVOICE,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_METERS,
     CONF_NAME_FORMAT,
+    CONF_SCAN_JITTER,
+    CONF_SNAPSHOT_MAX_AGE,
+    CONF_TRACING,
     CONF_USER_AGENT,
     DATA_API_OBJECTS,
+    DATA_API_STATES,
     DATA_ENTITIES,
     DATA_FINAL_CONFIG,
     DATA_PROVIDER_LOGOS,
     DATA_PROVIDER_LOGOS,
+    DATA_SNAPSHOTS,
+    DATA_UPDATE_COORDINATORS,
     DATA_UPDATE_DELEGATORS,
     DATA_UPDATE_LISTENERS,
     DATA_YAML_CONFIG,
@@ -64,6 +109,12 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+BACKGROUND_SETUP_RETRY_MIN: Final = 30  # 30 seconds
+BACKGROUND_SETUP_RETRY_MAX: Final = 60 * 60  # 1 hour
+
+SERVICE_DUMP_TRACE: Final = "dump_trace"
+SERVICE_DUMP_TRACE_SCHEMA: Final = vol.Schema({vol.Optional(ATTR_PATH): cv.string})
+
 
 def _unique_entries(value: List[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
     pairs: Dict[Tuple[str, str], Optional[int]] = {}
@@ -74,10 +125,14 @@ def _unique_entries(value: List[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
         if pair in pairs:
             if pairs[pair] is not None:
                 errors.append(
-                    vol.Invalid("duplicate unique key, first encounter", path=[pairs[pair]])
+                    vol.Invalid(
+                        "duplicate unique key, first encounter", path=[pairs[pair]]
+                    )
                 )
                 pairs[pair] = None
-            errors.append(vol.Invalid("duplicate unique key, subsequent encounter", path=[i]))
+            errors.append(
+                vol.Invalid("duplicate unique key, subsequent encounter", path=[i])
+            )
         else:
             pairs[pair] = i
 
@@ -93,7 +148,12 @@ CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Any(
             vol.Equal({}),
-            vol.All(cv.ensure_list, vol.Length(min=1), [CONFIG_ENTRY_SCHEMA], _unique_entries),
+            vol.All(
+                cv.ensure_list,
+                vol.Length(min=1),
+                [CONFIG_ENTRY_SCHEMA],
+                _unique_entries,
+            ),
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -102,6 +162,16 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType):
     """Set up the Inter RAO component."""
+    if hass.http is not None:
+        hass.http.register_view(LkcomuInterRAOMetricsView())
+
+    async def _async_dump_trace(call: ServiceCall) -> None:
+        await async_dump_trace(hass, call.data.get(ATTR_PATH))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_DUMP_TRACE, _async_dump_trace, schema=SERVICE_DUMP_TRACE_SCHEMA
+    )
+
     domain_config = config.get(DOMAIN)
     if not domain_config:
         return True
@@ -179,7 +249,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType):
 
     if not yaml_config:
         _LOGGER.debug(
-            "Конфигурация из YAML не обнаружена" if IS_IN_RUSSIA else "YAML configuration not found"
+            "Конфигурация из YAML не обнаружена"
+            if IS_IN_RUSSIA
+            else "YAML configuration not found"
         )
 
     return True
@@ -238,11 +310,13 @@ async def async_setup_entry(
 
     _LOGGER.info(
         log_prefix
-        + ("Применение конфигурационной записи" if IS_IN_RUSSIA else "Applying configuration entry")
+        + (
+            "Применение конфигурационной записи"
+            if IS_IN_RUSSIA
+            else "Applying configuration entry"
+        )
     )
 
-    from inter_rao_energosbyt.exceptions import EnergosbytException
-
     try:
         api_cls = import_api_cls(type_)
     except (ImportError, AttributeError):
@@ -267,41 +341,149 @@ async def async_setup_entry(
         password=user_cfg[CONF_PASSWORD],
         user_agent=user_cfg.get(CONF_USER_AGENT),
     )
+    span_recorder = SpanRecorder() if user_cfg[CONF_TRACING] else None
+    await async_get_connection_pool(hass, type_).async_attach(
+        api_object, () if span_recorder is None else (span_recorder.trace_config,)
+    )
+    async_setup_api_state(
+        hass, entry_id, api_object, ApiState(EntryMetrics(), span_recorder)
+    )
+    configure_response_cache(api_object, user_cfg[CONF_CACHE_TTL])
 
-    try:
+    snapshot = EntrySnapshot(hass, config_entry, user_cfg[CONF_SNAPSHOT_MAX_AGE])
+    use_snapshot = await snapshot.async_load()
+    background_setup = use_snapshot or user_cfg[CONF_BACKGROUND_SETUP]
+
+    if background_setup:
+        # Authenticate and discover accounts in background, once HA has started
+        _LOGGER.info(
+            log_prefix
+            + (
+                (
+                    "Объекты будут созданы из сохранённого снимка данных"
+                    if IS_IN_RUSSIA
+                    else "Entities will be created from saved data snapshot"
+                )
+                if use_snapshot
+                else (
+                    "Авторизация будет выполнена в фоновом режиме"
+                    if IS_IN_RUSSIA
+                    else "Authentication will be performed in background"
+                )
+            )
+        )
+
+    else:
         try:
-            await api_object.async_authenticate()
+            accounts = await async_authenticate_api(api_object, log_prefix)
+        except BaseException:
+            await async_release_api_object(hass, config_entry, api_object)
+            raise
 
-            # Fetch all accounts
-            accounts: Mapping[AccountID, "Account"] = await api_object.async_update_accounts(
-                with_related=True
+        if not accounts:
+            await async_release_api_object(hass, config_entry, api_object)
+            return False
+
+        if await async_handle_duplicate_profile(
+            hass, config_entry, api_object, log_prefix
+        ):
+            await async_release_api_object(hass, config_entry, api_object)
+            return False
+
+    # Create placeholders
+    hass_data.setdefault(DATA_API_OBJECTS, {})[entry_id] = api_object
+    hass_data.setdefault(DATA_SNAPSHOTS, {})[entry_id] = snapshot
+    hass_data.setdefault(DATA_ENTITIES, {})[entry_id] = {}
+    hass_data.setdefault(DATA_FINAL_CONFIG, {})[entry_id] = user_cfg
+    hass.data.setdefault(DATA_UPDATE_DELEGATORS, {})[entry_id] = {}
+    hass_data.setdefault(DATA_UPDATE_COORDINATORS, {})[entry_id] = (
+        LkcomuInterRAOCoordinator(
+            hass,
+            config_entry,
+            scan_jitter=user_cfg[CONF_SCAN_JITTER],
+            max_concurrent_requests=user_cfg[CONF_MAX_CONCURRENT_REQUESTS],
+        )
+    )
+
+    # Forward entry setup to sensor platform
+    await hass.config_entries.async_forward_entry_setups(
+        config_entry,
+        [SENSOR_DOMAIN, BINARY_SENSOR_DOMAIN],
+    )
+
+    # Create options update listener
+    update_listener = config_entry.add_update_listener(async_reload_entry)
+    hass_data.setdefault(DATA_UPDATE_LISTENERS, {})[entry_id] = update_listener
+
+    if background_setup:
+
+        @callback
+        def _async_start_background_setup(_: HomeAssistant) -> None:
+            config_entry.async_create_background_task(
+                hass,
+                async_background_setup_entry(hass, config_entry, log_prefix),
+                f"{DOMAIN}_background_setup_{entry_id}",
             )
 
-        except EnergosbytException as e:
-            err_cls = ConfigEntryNotReady
-            err_txt = "Ошибка при авторизации" if IS_IN_RUSSIA else "Error during authentication"
+        config_entry.async_on_unload(
+            async_at_started(hass, _async_start_background_setup)
+        )
+
+    _LOGGER.debug(
+        log_prefix
+        + ("Применение конфигурации успешно" if IS_IN_RUSSIA else "Setup successful")
+    )
+    return True
+
 
-            if len(e.args) == 3:
-                error_code = e.args[1]
-                if error_code in (131, 127, 114):
-                    err_cls = ConfigEntryAuthFailed
-                    err_txt = "Ошибка авторизации" if IS_IN_RUSSIA else "Error authenticating"
+async def async_authenticate_api(
+    api_object: "BaseEnergosbytAPI", log_prefix: str
+) -> Mapping["AccountID", "Account"]:
+    """Authenticate with API, and fetch all accounts"""
+    from inter_rao_energosbyt.exceptions import EnergosbytException
+
+    try:
+        await api_object.async_authenticate()
+
+        # Fetch all accounts
+        accounts: Mapping[AccountID, "Account"] = (
+            await api_object.async_update_accounts(with_related=True)
+        )
+
+    except EnergosbytException as e:
+        err_cls = ConfigEntryNotReady
+        err_txt = (
+            "Ошибка при авторизации" if IS_IN_RUSSIA else "Error during authentication"
+        )
+
+        if len(e.args) == 3:
+            error_code = e.args[1]
+            if error_code in (131, 127, 114):
+                err_cls = ConfigEntryAuthFailed
+                err_txt = (
+                    "Ошибка авторизации" if IS_IN_RUSSIA else "Error authenticating"
+                )
 
-            err_txt += ": " + repr(e)
-            _LOGGER.error(log_prefix + err_txt)
-            raise err_cls(repr(e))
+        err_txt += ": " + repr(e)
+        _LOGGER.error(log_prefix + err_txt)
+        raise err_cls(repr(e))
 
-    except BaseException:
-        await api_object.async_close()
-        raise
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        err_txt = (
+            "Ошибка соединения при авторизации"
+            if IS_IN_RUSSIA
+            else "Connection error during authentication"
+        )
+        _LOGGER.error(log_prefix + err_txt + ": " + repr(e))
+        raise ConfigEntryNotReady(repr(e))
 
     if not accounts:
         # Cancel setup because no accounts provided
         _LOGGER.warning(
-            log_prefix + ("Лицевые счета не найдены" if IS_IN_RUSSIA else "No accounts found")
+            log_prefix
+            + ("Лицевые счета не найдены" if IS_IN_RUSSIA else "No accounts found")
         )
-        await api_object.async_close()
-        return False
+        return accounts
 
     _LOGGER.debug(
         log_prefix
@@ -312,11 +494,32 @@ async def async_setup_entry(
         )
     )
 
+    return accounts
+
+
+async def async_handle_duplicate_profile(
+    hass: HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    api_object: "BaseEnergosbytAPI",
+    log_prefix: str,
+    in_background: bool = False,
+) -> bool:
+    """Disable config entry if its profile is already served by another entry.
+
+    Disabling unloads the entry, which cancels its background tasks; hence,
+    when called from one, disabling is scheduled as a separate task.
+    """
     profile_id = api_object.auth_session.id_profile
 
-    api_objects: Dict[str, "BaseEnergosbytAPI"] = hass_data.setdefault(DATA_API_OBJECTS, {})
+    api_objects: Dict[str, "BaseEnergosbytAPI"] = hass.data.get(DATA_API_OBJECTS, {})
     for existing_config_entry_id, existing_api_object in api_objects.items():
-        if existing_api_object.auth_session.id_profile == profile_id:
+        if existing_config_entry_id == config_entry.entry_id:
+            continue
+        existing_auth_session = existing_api_object.auth_session
+        if (
+            existing_auth_session is not None
+            and existing_auth_session.id_profile == profile_id
+        ):
             _LOGGER.warning(
                 log_prefix
                 + (
@@ -329,29 +532,81 @@ async def async_setup_entry(
                     f"ID: {existing_config_entry_id})"
                 )
             )
-            await hass.config_entries.async_set_disabled_by(config_entry.entry_id, DOMAIN)
-            return False
+            disable = hass.config_entries.async_set_disabled_by(
+                config_entry.entry_id, config_entries.ConfigEntryDisabler.USER
+            )
+            if in_background:
+                hass.async_create_task(disable)
+            else:
+                await disable
+            return True
 
-    # Create placeholders
-    api_objects[entry_id] = api_object
-    hass_data.setdefault(DATA_ENTITIES, {})[entry_id] = {}
-    hass_data.setdefault(DATA_FINAL_CONFIG, {})[entry_id] = user_cfg
-    hass.data.setdefault(DATA_UPDATE_DELEGATORS, {})[entry_id] = {}
+    return False
 
-    # Forward entry setup to sensor platform
-    await hass.config_entries.async_forward_entry_setups(
-        config_entry,
-        [SENSOR_DOMAIN, BINARY_SENSOR_DOMAIN],
-    )
 
-    # Create options update listener
-    update_listener = config_entry.add_update_listener(async_reload_entry)
-    hass_data.setdefault(DATA_UPDATE_LISTENERS, {})[entry_id] = update_listener
+async def async_background_setup_entry(
+    hass: HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    log_prefix: str,
+) -> None:
+    """Authenticate and discover accounts of entry whose setup was deferred.
+
+    Failed attempts (of authentication as well as of the initial data refresh)
+    are retried with exponential backoff, instead of letting HA retry the whole
+    entry setup.
+    """
+    from inter_rao_energosbyt.exceptions import EnergosbytException
 
-    _LOGGER.debug(
-        log_prefix + ("Применение конфигурации успешно" if IS_IN_RUSSIA else "Setup successful")
-    )
-    return True
+    api_object: "BaseEnergosbytAPI" = hass.data[DATA_API_OBJECTS][config_entry.entry_id]
+
+    accounts = None
+    retry_delay = BACKGROUND_SETUP_RETRY_MIN
+    while True:
+        try:
+            if accounts is None:
+                accounts = await async_authenticate_api(api_object, log_prefix)
+
+                if not accounts:
+                    return
+
+                if await async_handle_duplicate_profile(
+                    hass, config_entry, api_object, log_prefix, in_background=True
+                ):
+                    return
+
+            await async_refresh_api_data(hass, config_entry)
+        except ConfigEntryAuthFailed:
+            config_entry.async_start_reauth(hass)
+            return
+        except (
+            ConfigEntryNotReady,
+            EnergosbytException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as e:
+            if not isinstance(e, ConfigEntryNotReady):
+                _LOGGER.error(
+                    log_prefix
+                    + (
+                        "Ошибка при обновлении данных"
+                        if IS_IN_RUSSIA
+                        else "Error during data update"
+                    )
+                    + ": "
+                    + repr(e)
+                )
+            _LOGGER.info(
+                log_prefix
+                + (
+                    f"Повторная попытка через {retry_delay} секунд"
+                    if IS_IN_RUSSIA
+                    else f"Retrying in {retry_delay} seconds"
+                )
+            )
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, BACKGROUND_SETUP_RETRY_MAX)
+        else:
+            return
 
 
 async def async_reload_entry(
@@ -362,11 +617,25 @@ async def async_reload_entry(
     log_prefix = _make_log_prefix(config_entry, "setup")
     _LOGGER.info(
         log_prefix
-        + ("Перезагрузка интеграции" if IS_IN_RUSSIA else "Reloading configuration entry")
+        + (
+            "Перезагрузка интеграции"
+            if IS_IN_RUSSIA
+            else "Reloading configuration entry"
+        )
     )
     return await hass.config_entries.async_reload(config_entry.entry_id)
 
 
+async def async_release_api_object(
+    hass: HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    api_object: "BaseEnergosbytAPI",
+) -> None:
+    """Drop state kept for API object of entry, and detach it from connection pool"""
+    async_release_api_state(hass, config_entry.entry_id, api_object)
+    await async_release_connection_pool(hass, config_entry.data[CONF_TYPE], api_object)
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     config_entry: config_entries.ConfigEntry,
@@ -375,7 +644,9 @@ async def async_unload_entry(
     log_prefix = _make_log_prefix(config_entry, "setup")
     entry_id = config_entry.entry_id
 
-    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS].pop(entry_id)
+    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS].pop(
+        entry_id
+    )
 
     tasks = [
         hass.config_entries.async_forward_entry_unload(config_entry, domain)
@@ -385,15 +656,29 @@ async def async_unload_entry(
     unload_ok = all(await asyncio.gather(*tasks))
 
     if unload_ok:
-        hass.data[DATA_API_OBJECTS].pop(entry_id)
+        api_object: "BaseEnergosbytAPI" = hass.data[DATA_API_OBJECTS].pop(entry_id)
+        async_release_host_limiter(hass, api_object, entry_id)
+        await async_release_api_object(hass, config_entry, api_object)
         hass.data[DATA_FINAL_CONFIG].pop(entry_id)
 
+        snapshot: EntrySnapshot = hass.data[DATA_SNAPSHOTS].pop(entry_id)
+        await snapshot.async_save()
+
+        coordinator: LkcomuInterRAOCoordinator = hass.data[
+            DATA_UPDATE_COORDINATORS
+        ].pop(entry_id)
+        coordinator.async_shutdown()
+
         cancel_listener = hass.data[DATA_UPDATE_LISTENERS].pop(entry_id)
         cancel_listener()
 
         _LOGGER.info(
             log_prefix
-            + ("Интеграция выгружена" if IS_IN_RUSSIA else "Unloaded configuration entry")
+            + (
+                "Интеграция выгружена"
+                if IS_IN_RUSSIA
+                else "Unloaded configuration entry"
+            )
         )
 
     else:
@@ -407,3 +692,63 @@ async def async_unload_entry(
         )
 
     return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+) -> None:
+    """Remove persisted data of Lkcomu InterRAO entry"""
+    await EntrySnapshot(hass, config_entry).async_remove()
+
+
+async def async_dump_trace(hass: HomeAssistant, filename: Optional[str] = None) -> str:
+    """Save spans recorded by entries with tracing enabled as a Chrome trace file.
+
+    :return: Path of the saved file
+    """
+    api_states: Dict[str, ApiState] = hass.data.get(DATA_API_STATES) or {}
+    span_recorders: Dict[str, SpanRecorder] = {
+        entry_id: api_state.recorder
+        for entry_id, api_state in api_states.items()
+        if api_state.recorder is not None
+    }
+    if not span_recorders:
+        raise HomeAssistantError(
+            "Трассировка не включена ни для одной конфигурации"
+            if IS_IN_RUSSIA
+            else "Tracing is not enabled for any configuration entry"
+        )
+
+    if filename is None:
+        filename = hass.config.path(
+            f"{DOMAIN}_trace_{dt_util.now():%Y%m%d_%H%M%S}.json"
+        )
+    elif not hass.config.is_allowed_path(filename):
+        raise HomeAssistantError(
+            f"Путь не разрешён для записи: {filename}"
+            if IS_IN_RUSSIA
+            else f"Path is not allowed for writing: {filename}"
+        )
+
+    recorders = []
+    for entry_id, span_recorder in span_recorders.items():
+        config_entry = hass.config_entries.async_get_entry(entry_id)
+        process_name = entry_id
+        if config_entry is not None:
+            username = mask_username(config_entry.data[CONF_USERNAME])
+            process_name = f"{config_entry.data[CONF_TYPE]}/{username}"
+        recorders.append((process_name, span_recorder))
+
+    trace_events = make_trace_events(recorders)
+    await hass.async_add_executor_job(save_trace_events, filename, trace_events)
+
+    events_count = len(trace_events["traceEvents"])
+    _LOGGER.info(
+        (
+            f"Трассировка сохранена ({events_count} событий): {filename}"
+            if IS_IN_RUSSIA
+            else f"Trace saved ({events_count} events): {filename}"
+        )
+    )
+    return filename
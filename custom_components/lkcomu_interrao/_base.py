@@ -1,6 +1,12 @@
 __all__ = (
     "make_common_async_setup_entry",
+    "AccountMetadata",
     "LkcomuInterRAOEntity",
+    "get_account_metadata",
+    "HostLimiter",
+    "async_get_host_limiter",
+    "async_release_host_limiter",
+    "async_present_snapshot",
     "async_refresh_api_data",
     "async_register_update_delegator",
     "UpdateDelegatorsDataType",
@@ -10,13 +16,16 @@ __all__ = (
 
 import asyncio
 import logging
-import re
 from abc import abstractmethod
-from datetime import timedelta
+from itertools import zip_longest
+from datetime import datetime, timedelta
 from typing import (
     Any,
+    Awaitable,
     Callable,
     ClassVar,
+    Collection,
+    ContextManager,
     Dict,
     Generic,
     Hashable,
@@ -45,14 +54,37 @@ from homeassistant.const import (
 )
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.typing import ConfigType, StateType
-from homeassistant.util import as_local, utcnow
-from homeassistant.core import HomeAssistant
-
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.lkcomu_interrao._logging import (
+    MSG_ACCOUNT_FILTERED,
+    MSG_ACCOUNT_TYPE_UNIQUENESS,
+    MSG_FINAL_CONFIG,
+    MSG_LOGOS_ERROR,
+    MSG_NO_PLATFORMS,
+    MSG_PERFORMING_UPDATES,
+    MSG_PLANNING_UPDATE,
+    MSG_REFRESH_BEGIN,
+    PrefixedLogger,
+    make_entry_log_prefix,
+)
+from custom_components.lkcomu_interrao._metrics import (
+    CYCLE_REFRESH,
+    PHASE_ACCOUNTS,
+    PHASE_STATE_WRITES,
+    PHASE_UPDATE,
+    get_api_metrics,
+    trace_phase,
+)
+from custom_components.lkcomu_interrao._state import get_api_state
+from custom_components.lkcomu_interrao._tracing import trace_span
 from custom_components.lkcomu_interrao._util import (
     IS_IN_RUSSIA,
+    NameFormat,
     async_get_icons_for_providers,
+    mask_dev_presentation,
     mask_username,
     with_auto_auth,
 )
@@ -62,12 +94,18 @@ from custom_components.lkcomu_interrao.const import (
     ATTR_ACCOUNT_CODE,
     ATTR_ACCOUNT_ID,
     CONF_ACCOUNTS,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
     CONF_DEV_PRESENTATION,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_NAME_FORMAT,
     DATA_API_OBJECTS,
     DATA_ENTITIES,
     DATA_FINAL_CONFIG,
+    DATA_HOST_LIMITERS,
     DATA_PROVIDER_LOGOS,
+    DATA_SNAPSHOTS,
+    DATA_UPDATE_COORDINATORS,
     DATA_UPDATE_DELEGATORS,
     DOMAIN,
     FORMAT_VAR_ACCOUNT_CODE,
@@ -82,7 +120,9 @@ from inter_rao_energosbyt.enums import ProviderType
 
 if TYPE_CHECKING:
     from homeassistant.helpers.entity_registry import RegistryEntry
-    from inter_rao_energosbyt.interfaces import Account, BaseEnergosbytAPI
+    from custom_components.lkcomu_interrao._coordinator import LkcomuInterRAOCoordinator
+    from custom_components.lkcomu_interrao._snapshot import EntrySnapshot
+    from inter_rao_energosbyt.interfaces import Account, AccountID, BaseEnergosbytAPI
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -90,7 +130,9 @@ _TLkcomuInterRAOEntity = TypeVar("_TLkcomuInterRAOEntity", bound="LkcomuInterRAO
 
 AddEntitiesCallType = Callable[[List["MESEntity"], bool], Any]
 UpdateDelegatorsDataType = Dict[str, Tuple[AddEntitiesCallType, Set[Type["MESEntity"]]]]
-EntitiesDataType = Dict[Type["LkcomuInterRAOEntity"], Dict[Hashable, "LkcomuInterRAOEntity"]]
+EntitiesDataType = Dict[
+    Type["LkcomuInterRAOEntity"], Dict[Hashable, "LkcomuInterRAOEntity"]
+]
 
 
 def make_common_async_setup_entry(
@@ -141,60 +183,156 @@ async def async_register_update_delegator(
 ):
     entry_id = config_entry.entry_id
 
-    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS][entry_id]
+    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS][
+        entry_id
+    ]
     update_delegators[platform] = (async_add_entities, {entity_cls, *args})
 
     if update_after_complete:
         if len(update_delegators) != len(SUPPORTED_PLATFORMS):
             return
 
+        api: "BaseEnergosbytAPI" = hass.data[DATA_API_OBJECTS][entry_id]
+        if not api.is_authenticated:
+            # Setup is deferred until authentication succeeds in background
+            async_present_snapshot(hass, config_entry)
+            return
+
         await async_refresh_api_data(hass, config_entry)
 
 
+@callback
+def async_present_snapshot(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Add entities recreated from persisted snapshot of the entry"""
+    entry_id = config_entry.entry_id
+    snapshot: Optional["EntrySnapshot"] = hass.data.get(DATA_SNAPSHOTS, {}).get(
+        entry_id
+    )
+    if snapshot is None:
+        return
+
+    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS][
+        entry_id
+    ]
+
+    for platform, snapshot_entities in snapshot.async_create_entities().items():
+        if platform in update_delegators:
+            update_delegators[platform][0](snapshot_entities, False)
+
+
+class HostLimiter:
+    """Concurrency limiter of a provider host, with entries that make use of it"""
+
+    __slots__ = ("semaphore", "limit", "entry_ids")
+
+    def __init__(self, limit: int) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.limit = limit
+        self.entry_ids: Set[str] = set()
+
+
+def async_get_host_limiter(
+    hass: HomeAssistant, api: "BaseEnergosbytAPI", limit: int, entry_id: str
+) -> asyncio.Semaphore:
+    """Get concurrency limiter shared between all entries of the same provider host.
+
+    The limit of the entry that first requested the limiter is applied (a warning is
+    logged for entries that request a different one). The limiter is dropped once the
+    last entry using it is unloaded (see `async_release_host_limiter`).
+    """
+    host_limiters: Dict[str, HostLimiter] = hass.data.setdefault(DATA_HOST_LIMITERS, {})
+    hostname = urlparse(api.BASE_URL).netloc
+
+    try:
+        host_limiter = host_limiters[hostname]
+    except KeyError:
+        host_limiter = HostLimiter(limit)
+        host_limiters[hostname] = host_limiter
+
+    if entry_id not in host_limiter.entry_ids:
+        if host_limiter.limit != limit:
+            _LOGGER.warning(
+                (
+                    "[%s] Лимит одновременных запросов (%d) не применён, "
+                    "используется лимит других записей для этого сервера (%d)"
+                    if IS_IN_RUSSIA
+                    else "[%s] Concurrent requests limit (%d) is not applied, "
+                    "limit of other entries for this host is used instead (%d)"
+                ),
+                hostname,
+                limit,
+                host_limiter.limit,
+            )
+        host_limiter.entry_ids.add(entry_id)
+
+    return host_limiter.semaphore
+
+
+def async_release_host_limiter(
+    hass: HomeAssistant, api: "BaseEnergosbytAPI", entry_id: str
+) -> None:
+    host_limiters: Dict[str, HostLimiter] = hass.data.get(DATA_HOST_LIMITERS, {})
+    hostname = urlparse(api.BASE_URL).netloc
+
+    host_limiter = host_limiters.get(hostname)
+    if host_limiter is None:
+        return
+
+    host_limiter.entry_ids.discard(entry_id)
+    if not host_limiter.entry_ids:
+        del host_limiters[hostname]
+
+
 DEV_CLASSES_PROCESSED = set()
 
 
 async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry):
-    entry_id = config_entry.entry_id
-    api: "BaseEnergosbytAPI" = hass.data[DATA_API_OBJECTS][entry_id]
+    api: "BaseEnergosbytAPI" = hass.data[DATA_API_OBJECTS][config_entry.entry_id]
+    metrics = get_api_metrics(api)
 
-    accounts = await with_auto_auth(api, api.async_update_accounts, with_related=False)
+    with trace_span(api, "refresh_api_data", "refresh"):
+        if metrics is None:
+            return await _async_refresh_api_data(hass, config_entry, api)
 
-    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS][entry_id]
+        with metrics.measure_cycle(CYCLE_REFRESH):
+            return await _async_refresh_api_data(hass, config_entry, api)
 
-    log_prefix_base = (
-        f"[{config_entry.data[CONF_TYPE]}/{mask_username(config_entry.data[CONF_USERNAME])}]"
-    )
-    refresh_log_prefix = log_prefix_base + "[refresh] "
-
-    _LOGGER.info(
-        refresh_log_prefix
-        + (
-            "Запуск обновления связанных с профилем данных"
-            if IS_IN_RUSSIA
-            else "Beginning profile-related data update"
+
+async def _async_refresh_api_data(
+    hass: HomeAssistant, config_entry: ConfigEntry, api: "BaseEnergosbytAPI"
+):
+    entry_id = config_entry.entry_id
+    with trace_phase(PHASE_ACCOUNTS):
+        accounts = await with_auto_auth(
+            api,
+            api.async_update_accounts,
+            with_related=False,
+            endpoint="update_accounts",
         )
+
+    update_delegators: UpdateDelegatorsDataType = hass.data[DATA_UPDATE_DELEGATORS][
+        entry_id
+    ]
+
+    entry_logger = PrefixedLogger(
+        _LOGGER,
+        make_entry_log_prefix(
+            config_entry.data[CONF_TYPE], config_entry.data[CONF_USERNAME]
+        ),
     )
+    refresh_logger = entry_logger.get_child("[refresh] ")
+
+    refresh_logger.info(MSG_REFRESH_BEGIN)
 
     if not update_delegators:
         return
 
     try:
         provider_icons = await async_get_icons_for_providers(
-            api, set(map(lambda x: x.provider_type, accounts.values()))
+            hass, api, set(map(lambda x: x.provider_type, accounts.values()))
         )
     except BaseException as e:
-        _LOGGER.warning(
-            log_prefix_base
-            + "[logos] "
-            + (
-                "Произошла ошибка при обновлении логотипов"
-                if IS_IN_RUSSIA
-                else "Error occurred while updating logos"
-            )
-            + ": "
-            + repr(e)
-        )
+        entry_logger.warning("[logos] " + MSG_LOGOS_ERROR, e)
     else:
         if provider_icons:
             if DATA_PROVIDER_LOGOS in hass.data:
@@ -206,26 +344,21 @@ async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry)
     final_config: ConfigType = dict(hass.data[DATA_FINAL_CONFIG][entry_id])
 
     dev_presentation = final_config.get(CONF_DEV_PRESENTATION)
-    dev_log_prefix = log_prefix_base + "[dev] "
 
-    if dev_presentation:
+    if dev_presentation and _LOGGER.isEnabledFor(logging.DEBUG):
         from pprint import pformat
 
-        _LOGGER.debug(
-            dev_log_prefix
-            + ("Конечная конфигурация:" if IS_IN_RUSSIA else "Final configuration:")
-            + "\n"
-            + pformat(final_config)
-        )
+        entry_logger.debug("[dev] " + MSG_FINAL_CONFIG, pformat(final_config))
 
     platform_tasks = {}
+    account_tasks: Dict["AccountID", List[Tuple[str, str, str, Awaitable[Any]]]] = {}
 
     accounts_config = final_config.get(CONF_ACCOUNTS) or {}
     account_default_config = final_config[CONF_DEFAULT]
 
     for account_id, account in accounts.items():
         account_config = accounts_config.get(account.code)
-        account_log_prefix_base = refresh_log_prefix + f"[{mask_username(account.code)}]"
+        account_code = mask_username(account.code)
 
         if account_config is None:
             account_config = account_default_config
@@ -234,35 +367,21 @@ async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry)
             continue
 
         for platform, (_, entity_classes) in update_delegators.items():
-            platform_log_prefix_base = account_log_prefix_base + f"[{platform}]"
-            add_update_tasks = platform_tasks.setdefault(platform, [])
+            add_update_tasks = account_tasks.setdefault(account_id, [])
             for entity_cls in entity_classes:
-                cls_log_prefix_base = platform_log_prefix_base + f"[{entity_cls.__name__}]"
                 if account_config[entity_cls.config_key] is False:
-                    _LOGGER.debug(
-                        log_prefix_base
-                        + " "
-                        + (
-                            f"Лицевой счёт пропущен согласно фильтрации"
-                            if IS_IN_RUSSIA
-                            else f"Account skipped due to filtering"
-                        )
-                    )
+                    entry_logger.debug(" " + MSG_ACCOUNT_FILTERED)
                     continue
 
                 if dev_presentation:
                     dev_key = (entity_cls, account.provider_type)
                     if dev_key in DEV_CLASSES_PROCESSED:
-                        _LOGGER.debug(
-                            cls_log_prefix_base
-                            + "[dev] "
-                            + (
-                                f"Пропущен лицевой счёт ({mask_username(account.code)}) "
-                                f"по уникальности типа"
-                                if IS_IN_RUSSIA
-                                else f"Account skipped ({mask_username(account.code)}) "
-                                f"due to type uniqueness"
-                            )
+                        refresh_logger.debug(
+                            "[%s][%s][%s][dev] " + MSG_ACCOUNT_TYPE_UNIQUENESS,
+                            account_code,
+                            platform,
+                            entity_cls.__name__,
+                            account_code,
                         )
                         continue
 
@@ -270,85 +389,136 @@ async def async_refresh_api_data(hass: HomeAssistant, config_entry: ConfigEntry)
 
                 current_entities = entities.setdefault(entity_cls, {})
 
-                _LOGGER.debug(
-                    cls_log_prefix_base
-                    + "[update] "
-                    + (
-                        "Планирование процедуры обновления"
-                        if IS_IN_RUSSIA
-                        else "Planning update procedure"
-                    )
+                refresh_logger.debug(
+                    "[%s][%s][%s][update] " + MSG_PLANNING_UPDATE,
+                    account_code,
+                    platform,
+                    entity_cls.__name__,
                 )
 
+                platform_tasks[platform] = platform_tasks.get(platform, 0) + 1
                 add_update_tasks.append(
-                    entity_cls.async_refresh_accounts(
-                        current_entities,
-                        account,
-                        config_entry,
-                        account_config,
+                    (
+                        platform,
+                        entity_cls.__name__,
+                        account_code,
+                        entity_cls.async_refresh_accounts(
+                            current_entities,
+                            account,
+                            config_entry,
+                            account_config,
+                        ),
                     )
                 )
 
     if platform_tasks:
+        limiter = async_get_host_limiter(
+            hass, api, final_config[CONF_MAX_CONCURRENT_REQUESTS], entry_id
+        )
+        snapshot: Optional["EntrySnapshot"] = hass.data.get(DATA_SNAPSHOTS, {}).get(
+            entry_id
+        )
 
-        async def _wrap_update_task(update_task):
+        async def _wrap_update_task(platform, entity_class, account_code, update_task):
             try:
-                return await update_task
+                async with limiter:
+                    with (
+                        trace_phase(PHASE_UPDATE, entity_class=entity_class),
+                        trace_span(
+                            api,
+                            entity_class + ".async_refresh_accounts",
+                            "refresh",
+                            account=account_code,
+                        ),
+                    ):
+                        new_entities = await update_task
             except BaseException as task_exception:
-                _LOGGER.exception(
-                    f"Error occurred during task execution: {repr(task_exception)}",
+                refresh_logger.exception(
+                    "[%s][%s] Error occurred during task execution: %r",
+                    account_code,
+                    entity_class,
+                    task_exception,
                     exc_info=task_exception,
                 )
-                return None
-
-        all_updates_count = sum(map(len, platform_tasks.values()))
-        _LOGGER.info(
-            refresh_log_prefix
-            + (
-                f"Выполнение процедур обновления ({all_updates_count}) для платформ: "
-                f"{', '.join(platform_tasks.keys())}"
-                if IS_IN_RUSSIA
-                else f"Performing update procedures ({all_updates_count}) for platforms: "
-                f"{', '.join(platform_tasks.keys())}"
-            )
+                return
+
+            # Add entities as soon as their data arrives
+            if new_entities:
+                if snapshot is not None:
+                    # Regular entities take over unique IDs of snapshot entities
+                    await snapshot.async_release(
+                        [entity.unique_id for entity in new_entities]
+                    )
+                update_delegators[platform][0](new_entities, True)
+
+        # Interleave tasks of different accounts, so that limiter slots
+        # (which are handed out in FIFO order) are shared fairly between them.
+        ordered_tasks = [
+            task
+            for tasks_round in zip_longest(*account_tasks.values())
+            for task in tasks_round
+            if task is not None
+        ]
+
+        refresh_logger.info(
+            MSG_PERFORMING_UPDATES, len(ordered_tasks), ", ".join(platform_tasks)
         )
-        for platform, tasks in zip(
-            platform_tasks.keys(),
-            await asyncio.gather(
-                *map(
-                    lambda x: asyncio.gather(*map(_wrap_update_task, x)),
-                    platform_tasks.values(),
-                )
-            ),
-        ):
-            all_new_entities = []
-            for results in tasks:
-                if results is None:
-                    continue
-                all_new_entities.extend(results)
 
-            if all_new_entities:
-                update_delegators[platform][0](all_new_entities, True)
+        await asyncio.gather(*(_wrap_update_task(*task) for task in ordered_tasks))
+
+        if snapshot is not None:
+            await snapshot.async_release()
+            snapshot.async_prune(accounts.keys())
     else:
-        _LOGGER.warning(
-            refresh_log_prefix
-            + (
-                "Отсутствуют подходящие платформы для конфигурации"
-                if IS_IN_RUSSIA
-                else "Missing suitable platforms for configuration"
-            )
+        refresh_logger.warning(MSG_NO_PLATFORMS)
+
+
+class AccountMetadata:
+    """Presentation details of an account which stay the same for its lifetime.
+
+    Computed once per account, and shared by all entities of the account.
+    """
+
+    __slots__ = ("api_hostname", "provider_code", "attribution", "device_info")
+
+    def __init__(self, account: "Account") -> None:
+        api = account.api
+        self.api_hostname: str = urlparse(api.BASE_URL).netloc
+
+        try:
+            provider_code = ProviderType(account.provider_type).name.lower()
+        except (ValueError, TypeError):
+            provider_code = None
+        self.provider_code: Optional[str] = provider_code
+
+        self.attribution: str = (ATTRIBUTION_RU if IS_IN_RUSSIA else ATTRIBUTION_EN) % (
+            self.api_hostname
         )
 
+        self.device_info: Dict[str, Any] = {
+            "name": f"№ {account.code}",
+            "identifiers": {(DOMAIN, f"{account.__class__.__name__}__{account.id}")},
+            "manufacturer": account.provider_name,
+            "model": self.api_hostname,
+            "sw_version": api.APP_VERSION,  # placeholder for future releases
+        }
 
-class NameFormatDict(dict):
-    def __missing__(self, key: str):
-        if key.endswith("_upper") and key[:-6] in self:
-            return str(self[key[:-6]]).upper()
-        if key.endswith("_cap") and key[:-4] in self:
-            return str(self[key[:-4]]).capitalize()
-        if key.endswith("_title") and key[:-6] in self:
-            return str(self[key[:-6]]).title()
-        return "{{" + str(key) + "}}"
+        # account_address = account.address
+        # if account_address is not None:
+        #     self.device_info["suggested_area"] = account_address
+
+
+def get_account_metadata(account: "Account") -> AccountMetadata:
+    api_state = get_api_state(account.api)
+    if api_state is None:
+        return AccountMetadata(account)
+
+    try:
+        return api_state.account_metadata[account.id]
+    except KeyError:
+        metadata = AccountMetadata(account)
+        api_state.account_metadata[account.id] = metadata
+        return metadata
 
 
 _TData = TypeVar("_TData")
@@ -364,6 +534,9 @@ SupportedServicesType = Mapping[
 class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
     config_key: ClassVar[str] = NotImplemented
 
+    # Whether state attributes depend on the current date (and expire at midnight)
+    date_dependent_attributes: ClassVar[bool] = False
+
     _supported_services: ClassVar[SupportedServicesType] = {}
 
     def __init__(
@@ -374,28 +547,20 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
         self._account: _TAccount = account
         self._account_config: ConfigType = account_config
         self._entity_updater = None
+        self._state_fingerprint: Optional[int] = None
+        self._logger: Optional[Tuple[Optional[str], PrefixedLogger]] = None
+        self._name: Optional[str] = None
+        self._extra_state_attributes: Optional[Dict[str, Any]] = None
+        self._metadata: AccountMetadata = get_account_metadata(account)
+        self._unique_id: Optional[str] = None
 
     @property
     def api_hostname(self) -> str:
-        return urlparse(self._account.api.BASE_URL).netloc
+        return self._metadata.api_hostname
 
     @property
     def device_info(self) -> Dict[str, Any]:
-        account_object = self._account
-
-        device_info = {
-            "name": f"№ {account_object.code}",
-            "identifiers": {(DOMAIN, f"{account_object.__class__.__name__}__{account_object.id}")},
-            "manufacturer": account_object.provider_name,
-            "model": self.api_hostname,
-            "sw_version": account_object.api.APP_VERSION,  # placeholder for future releases
-        }
-
-        # account_address = account_object.address
-        # if account_address is not None:
-        #     device_info["suggested_area"] = account_address
-
-        return device_info
+        return self._metadata.device_info
 
     def _handle_dev_presentation(
         self,
@@ -425,10 +590,7 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
             for attr in filter_vars:
                 value = mapping.get(attr)
                 if value is not None:
-                    value = re.sub(r"[A-Za-z]", "X", str(value))
-                    value = re.sub(r"[0-9]", "#", value)
-                    value = re.sub(r"\w+", "*", value)
-                    mapping[attr] = value
+                    mapping[attr] = mask_dev_presentation(str(value))
 
     #################################################################################
     # Config getter helpers
@@ -436,18 +598,32 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
 
     @property
     def account_provider_code(self) -> Optional[str]:
-        try:
-            return ProviderType(self._account.provider_type).name.lower()
-        except (ValueError, TypeError):
-            return None
+        return self._metadata.provider_code
 
     @property
     def scan_interval(self) -> timedelta:
         return self._account_config[CONF_SCAN_INTERVAL][self.config_key]
 
     @property
-    def name_format(self) -> str:
-        return self._account_config[CONF_NAME_FORMAT][self.config_key]
+    def adaptive_scan_interval(self) -> bool:
+        return self._account_config[CONF_ADAPTIVE_SCAN_INTERVAL]
+
+    @property
+    def max_scan_interval(self) -> timedelta:
+        """Upper bound for adaptive scan interval, also used for idle polling"""
+        max_scan_interval = self._account_config[CONF_MAX_SCAN_INTERVAL][
+            self.config_key
+        ]
+        return max(max_scan_interval, self.scan_interval)
+
+    @property
+    def name_format(self) -> NameFormat:
+        name_format = self._account_config[CONF_NAME_FORMAT][self.config_key]
+        if not isinstance(name_format, NameFormat):
+            # Configuration did not pass through the schema
+            name_format = NameFormat(name_format)
+            self._account_config[CONF_NAME_FORMAT][self.config_key] = name_format
+        return name_format
 
     #################################################################################
     # Base overrides
@@ -463,12 +639,30 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
 
     @property
     def extra_state_attributes(self):
-        """Return the attribute(s) of the sensor"""
+        """Return the attribute(s) of the sensor.
 
+        Attributes are computed once after every update, and served from cache
+        until the next one (see `invalidate_extra_state_attributes`).
+        """
+        attributes = self._extra_state_attributes
+        if attributes is None:
+            attributes = self._compute_extra_state_attributes()
+            self._extra_state_attributes = attributes
+        return attributes
+
+    @callback
+    def invalidate_extra_state_attributes(self) -> None:
+        self._extra_state_attributes = None
+
+    @callback
+    def invalidate_cached_presentation(self) -> None:
+        """Drop cached attributes and name, once entity data has been updated"""
+        self._extra_state_attributes = None
+        self._name = None
+
+    def _compute_extra_state_attributes(self) -> Dict[str, Any]:
         attributes = {
-            ATTR_ATTRIBUTION: (
-                (ATTRIBUTION_RU if IS_IN_RUSSIA else ATTRIBUTION_EN) % self.api_hostname
-            ),
+            ATTR_ATTRIBUTION: self._metadata.attribution,
             **(self.sensor_related_attributes or {}),
         }
 
@@ -487,6 +681,17 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
 
     @property
     def name(self) -> Optional[str]:
+        """Return entity name.
+
+        Name is rendered once after every update, and served from cache until
+        the next one (see `invalidate_cached_presentation`). Name format only
+        changes along with entry options, which recreates entities.
+        """
+        name = self._name
+        if name is not None:
+            return name
+
+        account = self._account
         name_format_values = {
             key: ("" if value is None else str(value))
             for key, value in self.name_format_values.items()
@@ -496,16 +701,18 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
             name_format_values[FORMAT_VAR_CODE] = self.code
 
         if FORMAT_VAR_ACCOUNT_CODE not in name_format_values:
-            name_format_values[FORMAT_VAR_ACCOUNT_CODE] = self._account.code
+            name_format_values[FORMAT_VAR_ACCOUNT_CODE] = account.code
 
         if FORMAT_VAR_ACCOUNT_ID not in name_format_values:
-            name_format_values[FORMAT_VAR_ACCOUNT_ID] = str(self._account.id)
+            name_format_values[FORMAT_VAR_ACCOUNT_ID] = str(account.id)
 
         if FORMAT_VAR_PROVIDER_CODE not in name_format_values:
-            name_format_values[FORMAT_VAR_PROVIDER_CODE] = self.account_provider_code or "unknown"
+            name_format_values[FORMAT_VAR_PROVIDER_CODE] = (
+                self.account_provider_code or "unknown"
+            )
 
         if FORMAT_VAR_PROVIDER_NAME not in name_format_values:
-            name_format_values[FORMAT_VAR_PROVIDER_NAME] = self._account.provider_name
+            name_format_values[FORMAT_VAR_PROVIDER_NAME] = account.provider_name
 
         self._handle_dev_presentation(
             name_format_values,
@@ -513,25 +720,43 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
             (FORMAT_VAR_ACCOUNT_ID, FORMAT_VAR_ID),
         )
 
-        return self.name_format.format_map(NameFormatDict(name_format_values))
+        name = self.name_format.render(name_format_values)
+        self._name = name
+        return name
 
     #################################################################################
     # Hooks for adding entity to internal registry
     #################################################################################
 
     async def async_added_to_hass(self) -> None:
-        _LOGGER.info(self.log_prefix + "Adding to HomeAssistant")
+        self.logger.info("Adding to HomeAssistant")
         self.updater_restart()
 
+        if self.date_dependent_attributes:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_midnight_tick, hour=0, minute=0, second=0
+                )
+            )
+
+    @callback
+    def _async_midnight_tick(self, now: datetime) -> None:
+        """Refresh date-dependent attributes once the date changes"""
+        self.invalidate_extra_state_attributes()
+        if self.enabled:
+            self.async_write_ha_state_if_changed()
+
     async def async_will_remove_from_hass(self) -> None:
-        _LOGGER.info(self.log_prefix + "Removing from HomeAssistant")
+        self.logger.info("Removing from HomeAssistant")
         self.updater_stop()
 
         registry_entry: Optional["RegistryEntry"] = self.registry_entry
         if registry_entry:
             entry_id: Optional[str] = registry_entry.config_entry_id
             if entry_id:
-                data_entities: EntitiesDataType = self.hass.data[DATA_ENTITIES][entry_id]
+                data_entities: EntitiesDataType = self.hass.data[DATA_ENTITIES][
+                    entry_id
+                ]
                 cls_entities = data_entities.get(self.__class__)
                 if cls_entities:
                     remove_indices = []
@@ -545,48 +770,184 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
     # Updater management API
     #################################################################################
 
+    @property
+    def logger(self) -> PrefixedLogger:
+        """Logger of entity module, with prefix rebuilt only when entity ID changes"""
+        entity_id = self.entity_id
+        cached = self._logger
+        if cached is None or cached[0] != entity_id:
+            cached = (
+                entity_id,
+                PrefixedLogger(
+                    logging.getLogger(type(self).__module__),
+                    f"[{self.config_key}][{entity_id or '<no entity ID>'}] ",
+                ),
+            )
+            self._logger = cached
+        return cached[1]
+
     @property
     def log_prefix(self) -> str:
-        return f"[{self.config_key}][{self.entity_id or '<no entity ID>'}] "
+        return self.logger.prefix
 
     def updater_stop(self) -> None:
         if self._entity_updater is not None:
-            _LOGGER.debug(self.log_prefix + "Stopping updater")
+            self.logger.debug("Stopping updater")
             self._entity_updater()
             self._entity_updater = None
 
     def updater_restart(self) -> None:
-        log_prefix = self.log_prefix
-        scan_interval = self.scan_interval
-
         self.updater_stop()
 
-        async def _update_entity(*_):
-            nonlocal self
-            _LOGGER.debug(log_prefix + f"Executing updater on interval")
-            await self.async_update_ha_state(force_refresh=True)
+        config_entry = self.platform.config_entry
+        coordinator: Optional["LkcomuInterRAOCoordinator"] = self.hass.data.get(
+            DATA_UPDATE_COORDINATORS, {}
+        ).get(config_entry.entry_id)
+        if coordinator is None:
+            self.logger.warning("Update coordinator is not available")
+            return
 
-        _LOGGER.debug(
-            log_prefix + f"Starting updater "
-            f"(interval: {scan_interval.total_seconds()} seconds, "
-            f"next call: {as_local(utcnow()) + scan_interval})"
-        )
-        self._entity_updater = async_track_time_interval(
-            self.hass,
-            _update_entity,
-            scan_interval,
-        )
+        logger = self.logger
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Subscribing to coordinator updates (interval: %s seconds)",
+                self.scan_interval.total_seconds(),
+            )
+        self._entity_updater = coordinator.async_subscribe(self)
 
     async def updater_execute(self) -> None:
         self.updater_stop()
         try:
-            await self.async_update_ha_state(force_refresh=True)
+            await self.async_update_ha_state_if_changed()
         finally:
             self.updater_restart()
 
+    @property
+    def state_fingerprint(self) -> int:
+        """Fingerprint of everything written to the state machine"""
+        return hash(
+            repr(
+                (
+                    self.available,
+                    self.state,
+                    self.extra_state_attributes,
+                    self.name,
+                    self.icon,
+                    self.entity_picture,
+                )
+            )
+        )
+
+    def get_snapshot_record(self) -> Dict[str, Any]:
+        """Presentation of entity to be persisted in entry snapshot"""
+        return {
+            "platform": self.platform.domain,
+            "account_id": self._account.id,
+            "unique_id": self.unique_id,
+            "entity_id": self.entity_id,
+            "name": self.name,
+            "state": self.state,
+            "attributes": self.extra_state_attributes,
+            "icon": self.icon,
+            "entity_picture": self.entity_picture,
+            "device_class": self.device_class,
+            "unit_of_measurement": self.unit_of_measurement,
+            "device_info": self.device_info,
+        }
+
+    @property
+    def snapshot(self) -> Optional["EntrySnapshot"]:
+        return self.hass.data.get(DATA_SNAPSHOTS, {}).get(
+            self.platform.config_entry.entry_id
+        )
+
+    @callback
+    def _async_state_written(self) -> None:
+        snapshot = self.snapshot
+        if snapshot is not None:
+            snapshot.async_update_entity(self)
+
+        metrics = get_api_metrics(self._account.api)
+        if metrics is not None:
+            metrics.state_writes += 1
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._state_fingerprint = self.state_fingerprint
+        with trace_phase(PHASE_STATE_WRITES):
+            super().async_write_ha_state()
+        self._async_state_written()
+
+    @callback
+    def async_write_ha_state_if_changed(self, revalidated: bool = False) -> bool:
+        """Write state only when it differs from the last written one.
+
+        :param revalidated: Entity data has just been successfully updated, hence
+                            the snapshot record is refreshed even if the state
+                            has not changed
+        :return: Whether the state has been written
+        """
+        fingerprint = self.state_fingerprint
+        if fingerprint == self._state_fingerprint:
+            if revalidated:
+                snapshot = self.snapshot
+                if snapshot is not None:
+                    snapshot.async_revalidate_entity(self)
+            return False
+        self._state_fingerprint = fingerprint
+        with trace_phase(PHASE_STATE_WRITES):
+            super().async_write_ha_state()
+        self._async_state_written()
+        return True
+
+    async def async_update_ha_state_if_changed(self) -> bool:
+        """Refresh entity data, and write state only when it has changed"""
+        await self.async_device_update()
+        return self.async_write_ha_state_if_changed(revalidated=True)
+
+    def trace_update_internal(self) -> ContextManager[Optional[Dict[str, Any]]]:
+        return trace_span(
+            self._account.api,
+            type(self).__name__ + ".async_update_internal",
+            "update",
+            entity_id=self.entity_id,
+        )
+
     async def async_update(self) -> None:
         # @TODO: more sophisticated error handling
-        await with_auto_auth(self._account.api, self.async_update_internal)
+        try:
+            with self.trace_update_internal():
+                await with_auto_auth(self._account.api, self.async_update_internal)
+        finally:
+            self.invalidate_cached_presentation()
+
+    @classmethod
+    async def async_update_group(
+        cls: Type[_TLkcomuInterRAOEntity],
+        entities: Collection[_TLkcomuInterRAOEntity],
+    ) -> None:
+        """Update entities of a single account that share a configuration key.
+
+        Invoked by the coordinator once per tick; inherent classes may override it
+        to fetch shared data once for the whole group. Cached state attributes and
+        names of the entities are invalidated by the coordinator afterwards.
+        """
+        for entity in entities:
+            with entity.trace_update_internal():
+                await entity.async_update_internal()
+
+    @classmethod
+    def get_group_polling_hint(
+        cls: Type[_TLkcomuInterRAOEntity],
+        entities: Collection[_TLkcomuInterRAOEntity],
+        now: datetime,
+    ) -> Tuple[bool, Optional[datetime]]:
+        """Polling hint for entities of a single account that share a configuration key.
+
+        :return: Whether the group requires regular (dense) polling at the moment, and
+                 the next point in time when this may change (`None` if unknown)
+        """
+        return True, None
 
     #################################################################################
     # Functional base for inherent classes
@@ -637,8 +998,16 @@ class LkcomuInterRAOEntity(Entity, Generic[_TAccount]):
         raise NotImplementedError
 
     @property
-    @abstractmethod
     def unique_id(self) -> str:
+        unique_id = self._unique_id
+        if unique_id is None:
+            unique_id = self.make_unique_id()
+            self._unique_id = unique_id
+        return unique_id
+
+    @abstractmethod
+    def make_unique_id(self) -> str:
+        """Unique ID of the entity, evaluated once per entity"""
         raise NotImplementedError
 
     @property
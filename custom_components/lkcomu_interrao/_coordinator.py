@@ -0,0 +1,461 @@
+"""Per-config-entry update coordination for Inter RAO entities"""
+
+__all__ = (
+    "AdaptiveInterval",
+    "LkcomuInterRAOCoordinator",
+    "UpdateGroup",
+    "UpdateGroupKey",
+)
+
+import asyncio
+import logging
+import random
+import time
+import zlib
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+)
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TYPE, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util.dt import utcnow
+
+from custom_components.lkcomu_interrao._base import async_get_host_limiter
+from custom_components.lkcomu_interrao._logging import (
+    PrefixedLogger,
+    make_entry_log_prefix,
+)
+from custom_components.lkcomu_interrao._metrics import (
+    CYCLE_GROUP,
+    PHASE_UPDATE,
+    get_api_metrics,
+    trace_phase,
+)
+from custom_components.lkcomu_interrao._tracing import trace_span
+from custom_components.lkcomu_interrao._util import mask_username, with_auto_auth
+from custom_components.lkcomu_interrao.const import DEFAULT_MAX_CONCURRENT_REQUESTS
+
+if TYPE_CHECKING:
+    from inter_rao_energosbyt.interfaces import Account, AccountID
+    from custom_components.lkcomu_interrao._base import LkcomuInterRAOEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+UpdateGroupKey = Tuple[str, "AccountID"]
+
+_PHASE_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+class AdaptiveInterval:
+    """Scan interval that follows observed data change rate within bounds.
+
+    The expected change period is tracked as an exponential moving average of
+    gaps between observed changes. Interval aims at two polls per expected
+    period: it shrinks when data changes, and stretches while it stays unchanged.
+    """
+
+    __slots__ = (
+        "min_interval",
+        "max_interval",
+        "interval",
+        "change_period",
+        "last_change_at",
+    )
+
+    SMOOTHING: ClassVar[float] = 0.5
+    STRETCH_FACTOR: ClassVar[float] = 1.5
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.change_period: Optional[timedelta] = None
+        self.last_change_at: Optional[datetime] = None
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def update(self, changed: bool, now: datetime) -> timedelta:
+        last_change_at = self.last_change_at
+
+        if changed:
+            if last_change_at is not None:
+                gap = now - last_change_at
+                change_period = self.change_period
+                self.change_period = (
+                    gap
+                    if change_period is None
+                    else gap * self.SMOOTHING + change_period * (1 - self.SMOOTHING)
+                )
+            self.last_change_at = now
+
+            if self.change_period is None:
+                self.interval = self._clamp(self.interval / 2)
+            else:
+                self.interval = self._clamp(self.change_period / 2)
+
+        else:
+            interval = self.interval * self.STRETCH_FACTOR
+            if self.change_period is not None and last_change_at is not None:
+                # Long silence is evidence of a longer change period
+                interval = min(
+                    interval, max(self.change_period, now - last_change_at) / 2
+                )
+            self.interval = self._clamp(max(interval, self.interval))
+
+        return self.interval
+
+
+class UpdateGroup:
+    """Entities of a single account that share a configuration key (and schedule)"""
+
+    __slots__ = (
+        "key",
+        "account",
+        "logger",
+        "scan_interval",
+        "idle_interval",
+        "entities",
+        "adaptive",
+        "last_tick",
+        "next_tick",
+        "unsub_timer",
+        "task",
+    )
+
+    def __init__(
+        self,
+        key: UpdateGroupKey,
+        account: "Account",
+        logger: PrefixedLogger,
+        scan_interval: timedelta,
+        idle_interval: timedelta,
+        adaptive: bool = False,
+    ) -> None:
+        self.key = key
+        self.account = account
+        self.logger = logger
+        self.scan_interval = scan_interval
+        self.idle_interval = idle_interval
+        self.entities: Set["LkcomuInterRAOEntity"] = set()
+        self.adaptive: Optional[AdaptiveInterval] = (
+            AdaptiveInterval(scan_interval, idle_interval) if adaptive else None
+        )
+        self.last_tick: Optional[datetime] = None
+        self.next_tick: Optional[datetime] = None
+        self.unsub_timer: Optional[Callable[[], None]] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class LkcomuInterRAOCoordinator:
+    """Owner of update schedules for entities of a single config entry.
+
+    Entities are grouped by configuration key and account. Every group is served
+    by a single timer; data is fetched once per tick and then pushed to every
+    subscribed entity of the group. Group ticks are shifted by a deterministic
+    phase offset (and optional random jitter) to avoid synchronized request spikes.
+    Group updates share the concurrency limiter of provider host with entry refreshes.
+    Entity classes may additionally request idle polling and exact wake-ups through
+    their group polling hints.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        scan_jitter: Optional[timedelta] = None,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        self.hass = hass
+        self.config_entry = config_entry
+        self.scan_jitter = scan_jitter
+        self.max_concurrent_requests = max_concurrent_requests
+        self.logger = PrefixedLogger(
+            _LOGGER,
+            make_entry_log_prefix(
+                config_entry.data[CONF_TYPE], config_entry.data[CONF_USERNAME]
+            )
+            + "[coordinator] ",
+        )
+        self._groups: Dict[UpdateGroupKey, UpdateGroup] = {}
+        self.state_writes = 0
+        self.state_writes_skipped = 0
+
+    @property
+    def groups_count(self) -> int:
+        """Number of update groups currently scheduled"""
+        return len(self._groups)
+
+    @property
+    def state_writes_skip_ratio(self) -> float:
+        total = self.state_writes + self.state_writes_skipped
+        return self.state_writes_skipped / total if total else 0.0
+
+    @staticmethod
+    def get_group_key(entity: "LkcomuInterRAOEntity") -> UpdateGroupKey:
+        return entity.config_key, entity._account.id
+
+    @callback
+    def async_subscribe(self, entity: "LkcomuInterRAOEntity") -> Callable[[], None]:
+        """Subscribe entity to updates of its group, and return unsubscribe callback"""
+        key = self.get_group_key(entity)
+
+        try:
+            group = self._groups[key]
+        except KeyError:
+            group = UpdateGroup(
+                key,
+                entity._account,
+                self.logger.get_child(f"[{key[0]}][{key[1]}] "),
+                entity.scan_interval,
+                entity.max_scan_interval,
+                entity.adaptive_scan_interval,
+            )
+            self._groups[key] = group
+            group.entities.add(entity)
+            self._async_start_group(group)
+        else:
+            group.entities.add(entity)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self.async_unsubscribe(entity)
+
+        return _async_unsubscribe
+
+    @callback
+    def async_unsubscribe(self, entity: "LkcomuInterRAOEntity") -> None:
+        key = self.get_group_key(entity)
+        group = self._groups.get(key)
+        if group is None:
+            return
+
+        group.entities.discard(entity)
+
+        if not group.entities:
+            self._async_stop_group(group)
+            del self._groups[key]
+
+    def get_phase_offset(
+        self, group: UpdateGroup, interval: Optional[timedelta] = None
+    ) -> timedelta:
+        """Deterministic offset of group ticks within its interval.
+
+        Derived from entry ID and group key, so that groups of all entries are
+        spread evenly across the interval, and keep their phase across restarts.
+        """
+        config_key, account_id = group.key
+        phase_seed = f"{self.config_entry.entry_id}:{config_key}:{account_id}".encode()
+        if interval is None:
+            interval = group.scan_interval
+        return interval * (zlib.crc32(phase_seed) / 0x100000000)
+
+    def get_next_run(
+        self, group: UpdateGroup, now: datetime, interval: Optional[timedelta] = None
+    ) -> datetime:
+        """Next phase-aligned tick of the group strictly after `now`"""
+        if interval is None:
+            interval = group.scan_interval
+        anchor = _PHASE_EPOCH + self.get_phase_offset(group, interval)
+        return anchor + interval * ((now - anchor) // interval + 1)
+
+    @callback
+    def _async_schedule_group(self, group: UpdateGroup) -> None:
+        # Jittered ticks may fire ahead of their aligned time; scheduling relative
+        # to the previous aligned tick prevents the same tick from firing twice.
+        now = utcnow()
+        last_tick = group.last_tick
+        reference = now if last_tick is None else max(now, last_tick)
+
+        dense, boundary = True, None
+        if group.entities:
+            entity_cls = type(next(iter(group.entities)))
+            dense, boundary = entity_cls.get_group_polling_hint(group.entities, now)
+
+        if not dense:
+            interval = group.idle_interval
+            next_tick = self.get_next_run(group, reference, interval)
+        elif group.adaptive is None or last_tick is None:
+            interval = group.scan_interval
+            next_tick = self.get_next_run(group, reference)
+        else:
+            # Adaptive intervals vary between ticks, so only the first tick is
+            # phase-aligned
+            interval = group.adaptive.interval
+            next_tick = reference + interval
+
+        next_run = next_tick
+        if boundary is not None and boundary < next_tick:
+            # Exact wake-up at polling hint boundary, without jitter
+            next_tick = next_run = boundary
+        elif self.scan_jitter:
+            scan_jitter = min(self.scan_jitter, interval / 2)
+            next_run += scan_jitter * random.uniform(-1.0, 1.0)
+
+        group.next_tick = next_tick
+
+        async def _async_on_tick(*_) -> None:
+            group.unsub_timer = None
+            group.last_tick = group.next_tick
+            self._async_schedule_group(group)
+
+            if group.task is not None and not group.task.done():
+                group.logger.debug("Previous update still in progress, skipping tick")
+                return
+            group.task = self.hass.async_create_task(
+                self.async_refresh_group(group.key)
+            )
+
+        group.unsub_timer = async_track_point_in_utc_time(
+            self.hass, _async_on_tick, next_run
+        )
+
+    @callback
+    def _async_start_group(self, group: UpdateGroup) -> None:
+        if group.logger.isEnabledFor(logging.DEBUG):
+            group.logger.debug(
+                "Starting group updater "
+                "(interval: %s seconds, phase offset: %.0f seconds)",
+                group.scan_interval.total_seconds(),
+                self.get_phase_offset(group).total_seconds(),
+            )
+        self._async_schedule_group(group)
+
+    @callback
+    def _async_stop_group(self, group: UpdateGroup) -> None:
+        group.logger.debug("Stopping group updater")
+
+        if group.unsub_timer is not None:
+            group.unsub_timer()
+            group.unsub_timer = None
+
+        if group.task is not None and not group.task.done():
+            group.task.cancel()
+        group.task = None
+
+    async def async_refresh_group(self, key: UpdateGroupKey) -> None:
+        """Fetch data once for the whole group, and write states of its entities"""
+        group = self._groups.get(key)
+        if group is None or not group.entities:
+            return
+
+        entities: List["LkcomuInterRAOEntity"] = [
+            entity
+            for entity in group.entities
+            if entity.enabled and entity.hass is not None
+        ]
+        if not entities:
+            return
+
+        entity_cls = type(entities[0])
+        logger = group.logger
+
+        logger.debug("Executing group updater (%d entities)", len(entities))
+
+        metrics = get_api_metrics(group.account.api)
+        started_at = time.monotonic()
+        account_code = mask_username(group.account.code)
+        limiter = async_get_host_limiter(
+            self.hass,
+            group.account.api,
+            self.max_concurrent_requests,
+            self.config_entry.entry_id,
+        )
+
+        with (
+            nullcontext()
+            if metrics is None
+            else metrics.trace_cycle(
+                CYCLE_GROUP, f"{entity_cls.__name__}[{account_code}]"
+            )
+        ) as trace:
+            try:
+                with (
+                    trace_span(
+                        group.account.api,
+                        entity_cls.__name__ + ".async_update_group",
+                        "group",
+                        account=account_code,
+                        entities=len(entities),
+                    ),
+                    trace_phase(PHASE_UPDATE, entity_class=entity_cls.__name__),
+                ):
+                    try:
+                        async with limiter:
+                            await with_auto_auth(
+                                group.account.api,
+                                entity_cls.async_update_group,
+                                entities,
+                            )
+                    finally:
+                        # Entity data may have changed even if the update did not finish
+                        for entity in entities:
+                            entity.invalidate_cached_presentation()
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                logger.exception("Error occurred during group update: %r", e)
+                if metrics is not None:
+                    trace.failed = True
+                    metrics.record_cycle(
+                        CYCLE_GROUP, time.monotonic() - started_at, 0, failed=True
+                    )
+                return
+
+            written = skipped = 0
+            for entity in entities:
+                if entity.hass is None:
+                    continue
+                if entity.async_write_ha_state_if_changed(revalidated=True):
+                    written += 1
+                else:
+                    skipped += 1
+
+        self.state_writes += written
+        self.state_writes_skipped += skipped
+        if metrics is not None:
+            metrics.record_cycle(CYCLE_GROUP, time.monotonic() - started_at, written)
+        logger.debug(
+            "Group updater finished "
+            "(states written: %d, unchanged: %d, overall skip ratio: %.0f%%)",
+            written,
+            skipped,
+            self.state_writes_skip_ratio * 100,
+        )
+
+        adaptive = group.adaptive
+        if adaptive is not None:
+            changed = written > 0
+
+            previous_interval = adaptive.interval
+            interval = adaptive.update(changed, utcnow())
+            if interval != previous_interval:
+                logger.debug(
+                    "Adaptive interval changed "
+                    "(%.0f -> %.0f seconds, data changed: %s)",
+                    previous_interval.total_seconds(),
+                    interval.total_seconds(),
+                    changed,
+                )
+
+        # Refreshed data (and adaptive interval) may affect the schedule
+        if group.unsub_timer is not None:
+            group.unsub_timer()
+            self._async_schedule_group(group)
+
+    @callback
+    def async_shutdown(self) -> None:
+        for group in self._groups.values():
+            self._async_stop_group(group)
+        self._groups.clear()
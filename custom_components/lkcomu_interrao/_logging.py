@@ -0,0 +1,94 @@
+"""Deferred logging helpers for refresh and entity hot paths.
+
+Messages are emitted with `%`-style arguments, so that formatting only takes
+place for records that pass the level check. Bilingual messages are selected
+once on import, instead of on every call.
+"""
+
+__all__ = (
+    "MSG_ACCOUNT_FILTERED",
+    "MSG_ACCOUNT_TYPE_UNIQUENESS",
+    "MSG_FINAL_CONFIG",
+    "MSG_LOGOS_ERROR",
+    "MSG_NO_PLATFORMS",
+    "MSG_PERFORMING_UPDATES",
+    "MSG_PLANNING_UPDATE",
+    "MSG_REFRESH_BEGIN",
+    "PrefixedLogger",
+    "make_entry_log_prefix",
+)
+
+import logging
+from functools import lru_cache
+from typing import Any, Final
+
+from custom_components.lkcomu_interrao._util import IS_IN_RUSSIA, mask_username
+
+
+def _select(message_ru: str, message_en: str) -> str:
+    return message_ru if IS_IN_RUSSIA else message_en
+
+
+MSG_REFRESH_BEGIN: Final = _select(
+    "Запуск обновления связанных с профилем данных",
+    "Beginning profile-related data update",
+)
+MSG_LOGOS_ERROR: Final = _select(
+    "Произошла ошибка при обновлении логотипов: %r",
+    "Error occurred while updating logos: %r",
+)
+MSG_FINAL_CONFIG: Final = _select(
+    "Конечная конфигурация:\n%s", "Final configuration:\n%s"
+)
+MSG_ACCOUNT_FILTERED: Final = _select(
+    "Лицевой счёт пропущен согласно фильтрации",
+    "Account skipped due to filtering",
+)
+MSG_ACCOUNT_TYPE_UNIQUENESS: Final = _select(
+    "Пропущен лицевой счёт (%s) по уникальности типа",
+    "Account skipped (%s) due to type uniqueness",
+)
+MSG_PLANNING_UPDATE: Final = _select(
+    "Планирование процедуры обновления",
+    "Planning update procedure",
+)
+MSG_PERFORMING_UPDATES: Final = _select(
+    "Выполнение процедур обновления (%d) для платформ: %s",
+    "Performing update procedures (%d) for platforms: %s",
+)
+MSG_NO_PLATFORMS: Final = _select(
+    "Отсутствуют подходящие платформы для конфигурации",
+    "Missing suitable platforms for configuration",
+)
+
+
+class PrefixedLogger(logging.LoggerAdapter):
+    """Logger adapter which prepends a fixed prefix to messages.
+
+    The level is checked before the prefix is added, hence the prefix is only
+    concatenated for records that are actually emitted.
+    """
+
+    def __init__(self, logger: logging.Logger, prefix: str) -> None:
+        super().__init__(logger, None)
+        self.prefix = prefix
+        # Prefix becomes a part of the format string, but only for records that
+        # have arguments (messages without them are never %-formatted)
+        self._format_prefix = prefix.replace("%", "%%")
+
+    def log(self, level: int, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self.isEnabledFor(level):
+            self.logger.log(
+                level,
+                (self._format_prefix if args else self.prefix) + str(msg),
+                *args,
+                **kwargs,
+            )
+
+    def get_child(self, suffix: str) -> "PrefixedLogger":
+        return PrefixedLogger(self.logger, self.prefix + suffix)
+
+
+@lru_cache(maxsize=64)
+def make_entry_log_prefix(type_: str, username: str) -> str:
+    return f"[{type_}/{mask_username(username)}]"
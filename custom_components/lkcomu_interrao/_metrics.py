@@ -0,0 +1,393 @@
+"""Request and refresh metrics of Inter RAO config entries"""
+
+__all__ = (
+    "CYCLE_GROUP",
+    "CYCLE_REFRESH",
+    "CycleMetrics",
+    "EndpointMetrics",
+    "EntryMetrics",
+    "LATENCY_BUCKETS",
+    "LatencyHistogram",
+    "LkcomuInterRAOMetricsView",
+    "PHASE_ACCOUNTS",
+    "PHASE_AUTH",
+    "PHASE_STATE_WRITES",
+    "PHASE_UPDATE",
+    "REFRESH_TRACES_KEPT",
+    "RefreshTrace",
+    "get_api_metrics",
+    "trace_phase",
+)
+
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+)
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from custom_components.lkcomu_interrao._state import get_api_state
+from custom_components.lkcomu_interrao.const import DATA_API_STATES, DOMAIN
+
+if TYPE_CHECKING:
+    from inter_rao_energosbyt.interfaces import BaseEnergosbytAPI
+
+    from custom_components.lkcomu_interrao._state import ApiState
+
+LATENCY_BUCKETS: Final = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # seconds
+
+CYCLE_REFRESH: Final = "refresh"
+CYCLE_GROUP: Final = "group"
+
+REFRESH_TRACES_KEPT: Final = 10
+
+PHASE_AUTH: Final = "auth"
+PHASE_ACCOUNTS: Final = "accounts"
+PHASE_UPDATE: Final = "update"
+PHASE_STATE_WRITES: Final = "state_writes"
+
+
+class LatencyHistogram:
+    """Durations bucketed by upper bounds from `LATENCY_BUCKETS`"""
+
+    __slots__ = ("buckets", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": None if self.mean is None else round(self.mean, 6),
+            "max": round(self.max, 6),
+            "buckets": dict(zip((*map(str, LATENCY_BUCKETS), "+Inf"), self.buckets)),
+        }
+
+
+class EndpointMetrics:
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class CycleMetrics:
+    __slots__ = (
+        "count",
+        "errors",
+        "duration",
+        "last_duration",
+        "last_entities_written",
+        "last_finished_at",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.duration = LatencyHistogram()
+        self.last_duration: Optional[float] = None
+        self.last_entities_written: Optional[int] = None
+        self.last_finished_at: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "last_duration": self.last_duration,
+            "last_entities_written": self.last_entities_written,
+            "last_finished_at": self.last_finished_at,
+            "duration": self.duration.as_dict(),
+        }
+
+
+class RefreshTrace:
+    """Time spent in phases of a single refresh cycle (or coordinator group update).
+
+    Phases are accumulated across concurrent tasks, so their sum may exceed
+    the duration of the cycle itself. Entity class updates include the time
+    of the calls and state writes they perform.
+    """
+
+    __slots__ = (
+        "kind",
+        "name",
+        "started_at",
+        "duration",
+        "failed",
+        "phases",
+        "accounts",
+        "classes",
+        "_started",
+    )
+
+    def __init__(self, kind: str = CYCLE_REFRESH, name: Optional[str] = None) -> None:
+        self.kind = kind
+        self.name = name
+        self.started_at = dt_util.utcnow().isoformat()
+        self.duration: Optional[float] = None
+        self.failed = False
+        self.phases: Dict[str, List[float]] = {}
+        self.accounts: Dict[str, Dict[str, List[float]]] = {}
+        self.classes: Dict[str, Dict[str, List[float]]] = {}
+        self._started = time.monotonic()
+
+    def add(
+        self,
+        phase: str,
+        elapsed: float,
+        account: Optional[str] = None,
+        entity_class: Optional[str] = None,
+    ) -> None:
+        if account is not None:
+            target = self.accounts.setdefault(account, {})
+        elif entity_class is not None:
+            target = self.classes.setdefault(entity_class, {})
+        else:
+            target = self.phases
+
+        try:
+            totals = target[phase]
+        except KeyError:
+            target[phase] = [1, elapsed]
+        else:
+            totals[0] += 1
+            totals[1] += elapsed
+
+    def finish(self, failed: bool = False) -> None:
+        self.duration = round(time.monotonic() - self._started, 6)
+        self.failed = failed
+
+    def as_dict(self) -> Dict[str, Any]:
+        def _totals(phases: Dict[str, List[float]]) -> Dict[str, Any]:
+            return {
+                phase: {"count": count, "time": round(elapsed, 6)}
+                for phase, (count, elapsed) in phases.items()
+            }
+
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "failed": self.failed,
+            "phases": _totals(self.phases),
+            "accounts": {key: _totals(phases) for key, phases in self.accounts.items()},
+            "classes": {key: _totals(phases) for key, phases in self.classes.items()},
+        }
+
+
+_CURRENT_TRACE: ContextVar[Optional[RefreshTrace]] = ContextVar(
+    "lkcomu_interrao_refresh_trace", default=None
+)
+
+
+@contextmanager
+def trace_phase(
+    phase: str, account: Optional[str] = None, entity_class: Optional[str] = None
+) -> Iterator[None]:
+    """Add time of the enclosed code to the refresh cycle being traced, if any.
+
+    The trace is carried by context, and thus reaches tasks spawned by the cycle.
+    """
+    trace = _CURRENT_TRACE.get()
+    if trace is None or trace.duration is not None:
+        yield
+        return
+
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        trace.add(phase, time.monotonic() - started_at, account, entity_class)
+
+
+class EntryMetrics:
+    """Provider call and refresh cycle counters of a single config entry.
+
+    Provider calls are recorded by `async_record_call` under their endpoint name
+    (cache hits are not calls), refresh cycles by `async_refresh_api_data` and
+    the update coordinator.
+    Listeners are notified once a cycle finishes; the kind of the last finished
+    cycle is kept in `last_cycle_kind`. Phase timings of the last
+    `REFRESH_TRACES_KEPT` cycles of any kind are kept in `traces`.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.cycles: Dict[str, CycleMetrics] = {}
+        self.reauths = 0
+        self.reauth_failures = 0
+        self.state_writes = 0
+        self.last_cycle_kind: Optional[str] = None
+        self.traces: Deque[RefreshTrace] = deque(maxlen=REFRESH_TRACES_KEPT)
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def calls(self) -> int:
+        return sum(endpoint.calls for endpoint in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(endpoint.errors for endpoint in self.endpoints.values())
+
+    def record_call(self, endpoint: str, duration: float, failed: bool = False) -> None:
+        try:
+            endpoint_metrics = self.endpoints[endpoint]
+        except KeyError:
+            endpoint_metrics = EndpointMetrics()
+            self.endpoints[endpoint] = endpoint_metrics
+
+        endpoint_metrics.calls += 1
+        if failed:
+            endpoint_metrics.errors += 1
+        endpoint_metrics.latency.observe(duration)
+
+    def record_reauth(self, failed: bool = False) -> None:
+        self.reauths += 1
+        if failed:
+            self.reauth_failures += 1
+
+    def record_cycle(
+        self, kind: str, duration: float, entities_written: int, failed: bool = False
+    ) -> None:
+        try:
+            cycle_metrics = self.cycles[kind]
+        except KeyError:
+            cycle_metrics = CycleMetrics()
+            self.cycles[kind] = cycle_metrics
+
+        cycle_metrics.count += 1
+        if failed:
+            cycle_metrics.errors += 1
+        cycle_metrics.duration.observe(duration)
+        cycle_metrics.last_duration = round(duration, 6)
+        cycle_metrics.last_entities_written = entities_written
+        cycle_metrics.last_finished_at = dt_util.utcnow().isoformat()
+        self.last_cycle_kind = kind
+
+        for listener in tuple(self._listeners):
+            listener()
+
+    @contextmanager
+    def trace_cycle(
+        self, kind: str, name: Optional[str] = None
+    ) -> Iterator[RefreshTrace]:
+        """Trace phases of the enclosed code as a cycle (see `trace_phase`)"""
+        trace = RefreshTrace(kind, name)
+        token = _CURRENT_TRACE.set(trace)
+        failed = True
+        try:
+            yield trace
+            failed = False
+        finally:
+            _CURRENT_TRACE.reset(token)
+            # Failures handled within the enclosed code are flagged on the trace
+            trace.finish(failed or trace.failed)
+            self.traces.append(trace)
+
+    @contextmanager
+    def measure_cycle(self, kind: str) -> Iterator[None]:
+        """Record duration and state writes of the enclosed code as a cycle.
+
+        The cycle is traced as well (see `trace_cycle`).
+        """
+        started_at = time.monotonic()
+        state_writes = self.state_writes
+        failed = True
+        try:
+            with self.trace_cycle(kind):
+                yield
+            failed = False
+        finally:
+            self.record_cycle(
+                kind,
+                time.monotonic() - started_at,
+                self.state_writes - state_writes,
+                failed,
+            )
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        self._listeners.append(listener)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return _async_remove_listener
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "reauths": self.reauths,
+            "reauth_failures": self.reauth_failures,
+            "state_writes": self.state_writes,
+            "last_cycle_kind": self.last_cycle_kind,
+            "endpoints": {
+                endpoint: endpoint_metrics.as_dict()
+                for endpoint, endpoint_metrics in sorted(self.endpoints.items())
+            },
+            "cycles": {kind: cycle.as_dict() for kind, cycle in self.cycles.items()},
+        }
+
+
+def get_api_metrics(api: "BaseEnergosbytAPI") -> Optional[EntryMetrics]:
+    api_state = get_api_state(api)
+    return None if api_state is None else api_state.metrics
+
+
+class LkcomuInterRAOMetricsView(HomeAssistantView):
+    """Metrics of all config entries, keyed by entry ID"""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass = request.app[KEY_HASS]
+        api_states: Dict[str, "ApiState"] = hass.data.get(DATA_API_STATES, {})
+        return self.json(
+            {
+                entry_id: api_state.metrics.as_dict()
+                for entry_id, api_state in api_states.items()
+            }
+        )
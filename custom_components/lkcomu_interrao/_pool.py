@@ -0,0 +1,151 @@
+"""HTTP connection pools shared between config entries of the same API type"""
+
+__all__ = (
+    "ConnectionPool",
+    "async_get_connection_pool",
+    "async_release_connection_pool",
+)
+
+import logging
+from types import SimpleNamespace
+from typing import Any, Dict, Final, Iterable, TYPE_CHECKING
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from custom_components.lkcomu_interrao.const import DATA_CONNECTION_POOLS
+
+if TYPE_CHECKING:
+    from inter_rao_energosbyt.interfaces import BaseEnergosbytAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+POOL_LIMIT: Final = 32
+POOL_LIMIT_PER_HOST: Final = 8
+POOL_KEEPALIVE_TIMEOUT: Final = 60.0  # seconds
+POOL_DNS_CACHE_TTL: Final = 5 * 60  # 5 minutes
+
+
+class ConnectionPool:
+    """Connector (with TCP connections, DNS cache and TLS context) shared by APIs.
+
+    Every API object still gets its own client session on top of the shared
+    connector, so that cookie jars (and authentication) remain separate.
+    """
+
+    __slots__ = ("api_type", "connector", "users", "stats", "_trace_config")
+
+    def __init__(self, api_type: str) -> None:
+        self.api_type = api_type
+        self.connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+            use_dns_cache=True,
+            ttl_dns_cache=POOL_DNS_CACHE_TTL,
+            # Single SSL context lets TLS sessions be resumed across connections; HA's
+            # shared client context is reused, as building one blocks the event loop
+            ssl=get_default_context(),
+            enable_cleanup_closed=True,
+        )
+        self.users = 0
+        self.stats: Dict[str, int] = dict.fromkeys(
+            (
+                "requests",
+                "connections_created",
+                "connections_reused",
+                "connections_queued",
+                "dns_cache_hits",
+                "dns_cache_misses",
+            ),
+            0,
+        )
+        self._trace_config = self._make_trace_config()
+
+    def _make_trace_config(self) -> aiohttp.TraceConfig:
+        stats = self.stats
+        trace_config = aiohttp.TraceConfig()
+
+        for signal, stat in (
+            (trace_config.on_request_start, "requests"),
+            (trace_config.on_connection_create_end, "connections_created"),
+            (trace_config.on_connection_reuseconn, "connections_reused"),
+            (trace_config.on_connection_queued_start, "connections_queued"),
+            (trace_config.on_dns_cache_hit, "dns_cache_hits"),
+            (trace_config.on_dns_cache_miss, "dns_cache_misses"),
+        ):
+
+            async def _count(
+                session: aiohttp.ClientSession,
+                context: SimpleNamespace,
+                params: Any,
+                stat: str = stat,
+            ) -> None:
+                stats[stat] += 1
+
+            signal.append(_count)
+
+        return trace_config
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters of pool usage, along with its limits"""
+        return {
+            "api_type": self.api_type,
+            "users": self.users,
+            "limit": self.connector.limit,
+            "limit_per_host": self.connector.limit_per_host,
+            **self.stats,
+        }
+
+    async def async_attach(
+        self,
+        api: "BaseEnergosbytAPI",
+        trace_configs: Iterable[aiohttp.TraceConfig] = (),
+    ) -> None:
+        """Replace private session of API object with one over the shared connector"""
+        own_session = api._session
+        api._session = aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            headers=own_session.headers,
+            cookie_jar=aiohttp.CookieJar(),
+            trace_configs=[self._trace_config, *trace_configs],
+        )
+        self.users += 1
+        await own_session.close()
+
+    async def async_detach(self, api: "BaseEnergosbytAPI") -> None:
+        self.users -= 1
+        await api.async_close()
+
+
+@callback
+def async_get_connection_pool(hass: HomeAssistant, api_type: str) -> ConnectionPool:
+    pools: Dict[str, ConnectionPool] = hass.data.setdefault(DATA_CONNECTION_POOLS, {})
+    try:
+        return pools[api_type]
+    except KeyError:
+        pool = ConnectionPool(api_type)
+        pools[api_type] = pool
+        return pool
+
+
+async def async_release_connection_pool(
+    hass: HomeAssistant, api_type: str, api: "BaseEnergosbytAPI"
+) -> None:
+    """Close session of API object, and the pool itself once it has no more users"""
+    pools: Dict[str, ConnectionPool] = hass.data.get(DATA_CONNECTION_POOLS, {})
+    pool = pools.get(api_type)
+    if pool is None:
+        await api.async_close()
+        return
+
+    await pool.async_detach(api)
+
+    if pool.users <= 0:
+        _LOGGER.debug(
+            "[%s] Closing connection pool (statistics: %s)", api_type, pool.get_stats()
+        )
+        del pools[api_type]
+        await pool.connector.close()
@@ -13,18 +13,31 @@ from homeassistant.const import (
 )
 from homeassistant.helpers import config_validation as cv
 
-from custom_components.lkcomu_interrao._util import IS_IN_RUSSIA
+from custom_components.lkcomu_interrao._util import IS_IN_RUSSIA, NameFormat
 from custom_components.lkcomu_interrao.const import (
     API_TYPE_DEFAULT,
     API_TYPE_NAMES,
+    CACHE_ENDPOINTS,
     CONF_ACCOUNTS,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_BACKGROUND_SETUP,
+    CONF_CACHE_TTL,
     CONF_DEV_PRESENTATION,
+    CONF_DIAGNOSTIC_SENSORS,
     CONF_LAST_INVOICE,
     CONF_LAST_PAYMENT,
     CONF_LOGOS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_METERS,
     CONF_NAME_FORMAT,
+    CONF_SCAN_JITTER,
+    CONF_SNAPSHOT_MAX_AGE,
+    CONF_TRACING,
     CONF_USER_AGENT,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SCAN_INTERVAL,
     DEFAULT_NAME_FORMAT_EN_ACCOUNTS,
     DEFAULT_NAME_FORMAT_EN_LAST_INVOICE,
     DEFAULT_NAME_FORMAT_EN_LAST_PAYMENT,
@@ -34,6 +47,7 @@ from custom_components.lkcomu_interrao.const import (
     DEFAULT_NAME_FORMAT_RU_LAST_PAYMENT,
     DEFAULT_NAME_FORMAT_RU_METERS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SNAPSHOT_MAX_AGE,
 )
 
 MIN_SCAN_INTERVAL = timedelta(seconds=60)
@@ -61,12 +75,26 @@ MIN_SCAN_INTERVAL = timedelta(seconds=60)
 )
 
 
+def name_format(value: Any) -> NameFormat:
+    """Validate and compile entity name template"""
+    if isinstance(value, NameFormat):
+        return value
+    try:
+        return NameFormat(cv.string(value))
+    except ValueError as e:
+        raise vol.Invalid(f"invalid name format: {e}") from e
+
+
 NAME_FORMAT_SCHEMA = vol.Schema(
     {
-        vol.Optional(CONF_ACCOUNTS, default=default_name_format_accounts): cv.string,
-        vol.Optional(CONF_LAST_INVOICE, default=default_name_format_last_invoice): cv.string,
-        vol.Optional(CONF_METERS, default=default_name_format_meters): cv.string,
-        vol.Optional(CONF_LAST_PAYMENT, default=default_name_format_last_payment): cv.string,
+        vol.Optional(CONF_ACCOUNTS, default=default_name_format_accounts): name_format,
+        vol.Optional(
+            CONF_LAST_INVOICE, default=default_name_format_last_invoice
+        ): name_format,
+        vol.Optional(CONF_METERS, default=default_name_format_meters): name_format,
+        vol.Optional(
+            CONF_LAST_PAYMENT, default=default_name_format_last_payment
+        ): name_format,
     },
     extra=vol.PREVENT_EXTRA,
 )
@@ -74,10 +102,36 @@ NAME_FORMAT_SCHEMA = vol.Schema(
 
 SCAN_INTERVAL_SCHEMA = vol.Schema(
     {
-        vol.Optional(CONF_ACCOUNTS, default=DEFAULT_SCAN_INTERVAL): cv.positive_time_period,
-        vol.Optional(CONF_LAST_INVOICE, default=DEFAULT_SCAN_INTERVAL): cv.positive_time_period,
-        vol.Optional(CONF_METERS, default=DEFAULT_SCAN_INTERVAL): cv.positive_time_period,
-        vol.Optional(CONF_LAST_PAYMENT, default=DEFAULT_SCAN_INTERVAL): cv.positive_time_period,
+        vol.Optional(
+            CONF_ACCOUNTS, default=DEFAULT_SCAN_INTERVAL
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_LAST_INVOICE, default=DEFAULT_SCAN_INTERVAL
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_METERS, default=DEFAULT_SCAN_INTERVAL
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_LAST_PAYMENT, default=DEFAULT_SCAN_INTERVAL
+        ): cv.positive_time_period,
+    }
+)
+
+
+MAX_SCAN_INTERVAL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_ACCOUNTS, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_LAST_INVOICE, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_METERS, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_LAST_PAYMENT, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): cv.positive_time_period,
     }
 )
 
@@ -98,19 +152,36 @@ GENERIC_ACCOUNT_SCHEMA = vol.Schema(
         vol.Optional(CONF_LOGOS, default=True): cv.boolean,
         vol.Optional(CONF_DEV_PRESENTATION, default=False): cv.boolean,
         vol.Optional(CONF_NAME_FORMAT, default=lambda: NAME_FORMAT_SCHEMA({})): vol.Any(
-            vol.All(cv.string, lambda x: {CONF_ACCOUNTS: x}, NAME_FORMAT_SCHEMA),
+            vol.All(name_format, lambda x: {CONF_ACCOUNTS: x}, NAME_FORMAT_SCHEMA),
             NAME_FORMAT_SCHEMA,
         ),
-        vol.Optional(CONF_SCAN_INTERVAL, default=lambda: SCAN_INTERVAL_SCHEMA({})): vol.Any(
+        vol.Optional(
+            CONF_SCAN_INTERVAL, default=lambda: SCAN_INTERVAL_SCHEMA({})
+        ): vol.Any(
             vol.All(
                 cv.positive_time_period,
                 lambda x: dict.fromkeys(
-                    (CONF_ACCOUNTS, CONF_LAST_INVOICE, CONF_METERS, CONF_LAST_PAYMENT), x
+                    (CONF_ACCOUNTS, CONF_LAST_INVOICE, CONF_METERS, CONF_LAST_PAYMENT),
+                    x,
                 ),
                 SCAN_INTERVAL_SCHEMA,
             ),
             SCAN_INTERVAL_SCHEMA,
         ),
+        vol.Optional(CONF_ADAPTIVE_SCAN_INTERVAL, default=False): cv.boolean,
+        vol.Optional(
+            CONF_MAX_SCAN_INTERVAL, default=lambda: MAX_SCAN_INTERVAL_SCHEMA({})
+        ): vol.Any(
+            vol.All(
+                cv.positive_time_period,
+                lambda x: dict.fromkeys(
+                    (CONF_ACCOUNTS, CONF_LAST_INVOICE, CONF_METERS, CONF_LAST_PAYMENT),
+                    x,
+                ),
+                MAX_SCAN_INTERVAL_SCHEMA,
+            ),
+            MAX_SCAN_INTERVAL_SCHEMA,
+        ),
     },
     extra=vol.PREVENT_EXTRA,
 )
@@ -145,7 +216,11 @@ def _make_provider_schema(
             vol.Optional(CONF_DEFAULT, default=lambda: accounts_schema({}))
         ] = accounts_validator
         add_to_config[vol.Optional(CONF_ACCOUNTS)] = vol.Any(
-            vol.All(cv.ensure_list, [cv.string], lambda x: {y: accounts_schema({}) for y in x}),
+            vol.All(
+                cv.ensure_list,
+                [cv.string],
+                lambda x: {y: accounts_schema({}) for y in x},
+            ),
             vol.Schema({cv.string: accounts_validator}),
         )
 
@@ -154,6 +229,24 @@ def _make_provider_schema(
 
 PROFILE_TYPE_VALIDATOR = vol.In(API_TYPE_NAMES)
 
+CACHE_TTL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            endpoint, default=timedelta(seconds=DEFAULT_CACHE_TTL)
+        ): cv.positive_time_period
+        for endpoint in CACHE_ENDPOINTS
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+CACHE_TTL_VALIDATOR = vol.Any(
+    CACHE_TTL_SCHEMA,  # For per-endpoint TTLs
+    vol.All(  # For a single TTL of all endpoints
+        cv.positive_time_period,
+        lambda x: CACHE_TTL_SCHEMA(dict.fromkeys(CACHE_ENDPOINTS, x)),
+    ),
+)
+
 
 GENERIC_CONFIG_ENTRY_SCHEMA = vol.Schema(
     {
@@ -162,6 +255,19 @@ GENERIC_CONFIG_ENTRY_SCHEMA = vol.Schema(
         vol.Required(CONF_USERNAME): cv.string,
         vol.Required(CONF_PASSWORD): cv.string,
         vol.Optional(CONF_DEV_PRESENTATION, default=False): cv.boolean,
+        vol.Optional(CONF_BACKGROUND_SETUP, default=False): cv.boolean,
+        vol.Optional(CONF_DIAGNOSTIC_SENSORS, default=False): cv.boolean,
+        vol.Optional(CONF_TRACING, default=False): cv.boolean,
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS, default=DEFAULT_MAX_CONCURRENT_REQUESTS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_SCAN_JITTER, default=timedelta(0)): cv.positive_time_period,
+        vol.Optional(
+            CONF_SNAPSHOT_MAX_AGE, default=timedelta(seconds=DEFAULT_SNAPSHOT_MAX_AGE)
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_CACHE_TTL, default=lambda: CACHE_TTL_SCHEMA({})
+        ): CACHE_TTL_VALIDATOR,
         # Additional API configuration
         vol.Optional(CONF_USER_AGENT): vol.All(
             cv.string, lambda x: " ".join(map(str.strip, x.split("\n")))
@@ -171,7 +277,9 @@ GENERIC_CONFIG_ENTRY_SCHEMA = vol.Schema(
         ): GENERIC_ACCOUNT_VALIDATOR,
         vol.Optional(CONF_ACCOUNTS): vol.Any(
             vol.All(
-                cv.ensure_list, [cv.string], lambda x: {y: GENERIC_ACCOUNT_SCHEMA({}) for y in x}
+                cv.ensure_list,
+                [cv.string],
+                lambda x: {y: GENERIC_ACCOUNT_SCHEMA({}) for y in x},
             ),
             vol.Schema({cv.string: GENERIC_ACCOUNT_VALIDATOR}),
         ),
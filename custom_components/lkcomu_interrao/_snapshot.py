@@ -0,0 +1,261 @@
+"""Persistent snapshots of entity presentation for Inter RAO config entries"""
+
+__all__ = (
+    "EntrySnapshot",
+    "LkcomuInterRAOSnapshotEntity",
+    "SnapshotRecord",
+)
+
+import logging
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Final,
+    List,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+)
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TYPE, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import StateType
+from homeassistant.util import dt as dt_util
+
+from custom_components.lkcomu_interrao._util import IS_IN_RUSSIA, mask_username
+from custom_components.lkcomu_interrao.const import (
+    ATTR_SNAPSHOT_AT,
+    ATTR_STALE,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from inter_rao_energosbyt.interfaces import AccountID
+    from custom_components.lkcomu_interrao._base import LkcomuInterRAOEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 30  # seconds
+
+SnapshotRecord = Dict[str, Any]
+
+
+class LkcomuInterRAOSnapshotEntity(Entity):
+    """Stand-in for an entity, presenting its last persisted state.
+
+    Snapshot entities exist only until data is revalidated with the provider,
+    and are then replaced by regular entities with the same unique ID.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, record: SnapshotRecord, max_age: timedelta) -> None:
+        self._record = record
+        self._updated_at: datetime = dt_util.parse_datetime(record["updated_at"])
+        self._stale_at: datetime = self._updated_at + max_age
+        self._unsub_stale: Optional[Callable[[], None]] = None
+
+        self.entity_id = record["entity_id"]
+        self._attr_unique_id = record["unique_id"]
+        self._attr_name = record["name"]
+        self._attr_icon = record["icon"]
+        self._attr_entity_picture = record["entity_picture"]
+        self._attr_device_class = record["device_class"]
+        self._attr_unit_of_measurement = record["unit_of_measurement"]
+
+        device_info = record["device_info"]
+        if device_info:
+            device_info = dict(device_info)
+            device_info["identifiers"] = set(
+                map(tuple, device_info.get("identifiers") or ())
+            )
+        self._attr_device_info = device_info
+
+    @property
+    def platform_domain(self) -> str:
+        return self._record["platform"]
+
+    @property
+    def is_stale(self) -> bool:
+        return dt_util.utcnow() >= self._stale_at
+
+    @property
+    def state(self) -> StateType:
+        return self._record["state"]
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        return {
+            **(self._record["attributes"] or {}),
+            ATTR_SNAPSHOT_AT: self._updated_at.isoformat(),
+            ATTR_STALE: self.is_stale,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        if not self.is_stale:
+
+            @callback
+            def _async_mark_stale(*_) -> None:
+                self._unsub_stale = None
+                self.async_write_ha_state()
+
+            self._unsub_stale = async_track_point_in_utc_time(
+                self.hass, _async_mark_stale, self._stale_at
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+
+class EntrySnapshot:
+    """Last known presentation of entities of a single config entry.
+
+    Records are kept in HA storage, so that entities may be presented right
+    after startup, before the provider is queried for fresh data.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        max_age: timedelta = timedelta(seconds=DEFAULT_SNAPSHOT_MAX_AGE),
+    ) -> None:
+        self.hass = hass
+        self.max_age = max_age
+        username = mask_username(config_entry.data[CONF_USERNAME])
+        self.log_prefix = f"[{config_entry.data[CONF_TYPE]}/{username}][snapshot] "
+        self.records: Dict[str, SnapshotRecord] = {}
+        self.entities: Dict[str, LkcomuInterRAOSnapshotEntity] = {}
+        self._store = Store(
+            hass,
+            SNAPSHOT_STORAGE_VERSION,
+            f"{DOMAIN}.{config_entry.entry_id}",
+            private=True,
+        )
+
+    async def async_load(self) -> bool:
+        """Load records from storage, and return whether any were found"""
+        try:
+            data = await self._store.async_load()
+        except BaseException as e:
+            _LOGGER.warning(
+                self.log_prefix
+                + (
+                    "Не удалось загрузить снимок данных"
+                    if IS_IN_RUSSIA
+                    else "Could not load data snapshot"
+                )
+                + ": "
+                + repr(e)
+            )
+            return False
+
+        if not data:
+            return False
+
+        self.records = {
+            record["unique_id"]: record for record in data.get("entities") or ()
+        }
+
+        _LOGGER.debug(
+            self.log_prefix
+            + (
+                f"Загружен снимок данных ({len(self.records)} объектов)"
+                if IS_IN_RUSSIA
+                else f"Loaded data snapshot ({len(self.records)} entities)"
+            )
+        )
+        return bool(self.records)
+
+    @callback
+    def _data_to_save(self) -> Mapping[str, Any]:
+        return {"entities": list(self.records.values())}
+
+    @callback
+    def async_update_entity(self, entity: "LkcomuInterRAOEntity") -> None:
+        """Record current presentation of entity, and schedule snapshot saving"""
+        if not entity.available:
+            return
+
+        record = entity.get_snapshot_record()
+        record["updated_at"] = dt_util.utcnow().isoformat()
+        self.records[record["unique_id"]] = record
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_revalidate_entity(self, entity: "LkcomuInterRAOEntity") -> None:
+        """Mark recorded presentation of entity as revalidated with the provider"""
+        if not entity.available:
+            return
+
+        record = self.records.get(entity.unique_id)
+        if record is None:
+            self.async_update_entity(entity)
+            return
+
+        record["updated_at"] = dt_util.utcnow().isoformat()
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_forget(self, unique_id: str) -> None:
+        if self.records.pop(unique_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_prune(self, account_ids: Collection["AccountID"]) -> None:
+        """Drop records of entities that belong to accounts no longer present"""
+        account_ids = set(account_ids)
+        remove_ids = [
+            unique_id
+            for unique_id, record in self.records.items()
+            if record.get("account_id") not in account_ids
+        ]
+        if remove_ids:
+            for unique_id in remove_ids:
+                del self.records[unique_id]
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_create_entities(self) -> Dict[str, List[LkcomuInterRAOSnapshotEntity]]:
+        """Create snapshot entities from records, grouped by platform"""
+        platform_entities: Dict[str, List[LkcomuInterRAOSnapshotEntity]] = {}
+
+        for unique_id, record in self.records.items():
+            if unique_id in self.entities:
+                continue
+            try:
+                entity = LkcomuInterRAOSnapshotEntity(record, self.max_age)
+            except (KeyError, TypeError, ValueError) as e:
+                _LOGGER.warning(self.log_prefix + f"Skipping invalid record: {repr(e)}")
+                continue
+            self.entities[unique_id] = entity
+            platform_entities.setdefault(entity.platform_domain, []).append(entity)
+
+        return platform_entities
+
+    async def async_release(self, unique_ids: Optional[Collection[str]] = None) -> None:
+        """Remove snapshot entities (all by default) to make way for regular entities"""
+        if unique_ids is None:
+            unique_ids = list(self.entities.keys())
+
+        for unique_id in unique_ids:
+            entity = self.entities.pop(unique_id, None)
+            if entity is not None and entity.hass is not None:
+                await entity.async_remove()
+
+    async def async_save(self) -> None:
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
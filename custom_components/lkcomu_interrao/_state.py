@@ -0,0 +1,75 @@
+"""State of config entries, shared by helpers that only get an API object"""
+
+__all__ = (
+    "ApiState",
+    "AuthState",
+    "async_release_api_state",
+    "async_setup_api_state",
+    "get_api_state",
+)
+
+import asyncio
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.lkcomu_interrao.const import DATA_API_STATES
+
+if TYPE_CHECKING:
+    from inter_rao_energosbyt.interfaces import AccountID, BaseEnergosbytAPI
+
+    from custom_components.lkcomu_interrao._base import AccountMetadata
+    from custom_components.lkcomu_interrao._metrics import EntryMetrics
+    from custom_components.lkcomu_interrao._tracing import SpanRecorder
+
+
+class AuthState:
+    __slots__ = ("lock", "generation")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.generation = 0
+
+
+class ApiState:
+    """Everything kept for the API object of a config entry.
+
+    Stored in `hass.data[DATA_API_STATES]` by entry ID, and dropped at once with
+    `async_release_api_state` when the entry is unloaded (or fails to set up).
+    """
+
+    __slots__ = ("auth", "metrics", "recorder", "response_cache", "account_metadata")
+
+    def __init__(
+        self, metrics: "EntryMetrics", recorder: Optional["SpanRecorder"] = None
+    ) -> None:
+        self.auth = AuthState()
+        self.metrics = metrics
+        self.recorder = recorder
+        # Set by `configure_response_cache`
+        self.response_cache: Optional[Any] = None
+        self.account_metadata: Dict["AccountID", "AccountMetadata"] = {}
+
+
+# API objects do not support weak references, hence the explicit release
+_API_STATES: Dict["BaseEnergosbytAPI", ApiState] = {}
+
+
+def get_api_state(api: "BaseEnergosbytAPI") -> Optional[ApiState]:
+    return _API_STATES.get(api)
+
+
+@callback
+def async_setup_api_state(
+    hass: HomeAssistant, entry_id: str, api: "BaseEnergosbytAPI", api_state: ApiState
+) -> None:
+    hass.data.setdefault(DATA_API_STATES, {})[entry_id] = api_state
+    _API_STATES[api] = api_state
+
+
+@callback
+def async_release_api_state(
+    hass: HomeAssistant, entry_id: str, api: "BaseEnergosbytAPI"
+) -> None:
+    hass.data.get(DATA_API_STATES, {}).pop(entry_id, None)
+    _API_STATES.pop(api, None)
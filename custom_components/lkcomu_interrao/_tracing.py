@@ -0,0 +1,244 @@
+"""Span tracing of refresh cycles, exportable in Chrome trace event format"""
+
+__all__ = (
+    "SPAN_BUFFER_SIZE",
+    "SpanRecorder",
+    "get_api_recorder",
+    "make_trace_events",
+    "save_trace_events",
+    "trace_span",
+)
+
+import asyncio
+import json
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+)
+
+import aiohttp
+
+from custom_components.lkcomu_interrao._state import get_api_state
+
+if TYPE_CHECKING:
+    from inter_rao_energosbyt.interfaces import BaseEnergosbytAPI
+
+SPAN_BUFFER_SIZE: Final = 20000
+
+# Name, category, start (us), duration (us), thread ID, arguments
+Span = Tuple[str, str, int, int, int, Optional[Dict[str, Any]]]
+
+
+def _now_us() -> int:
+    return time.monotonic_ns() // 1000
+
+
+class SpanRecorder:
+    """Bounded ring buffer of completed spans of a single config entry.
+
+    Every asyncio task gets its own thread ID, so that concurrent work (e.g.
+    requests made on behalf of different accounts) shows up on separate
+    tracks when viewed in `chrome://tracing` or Perfetto.
+    """
+
+    __slots__ = (
+        "spans",
+        "thread_names",
+        "_task_ids",
+        "_next_thread_id",
+        "_trace_config",
+    )
+
+    def __init__(self, size: int = SPAN_BUFFER_SIZE) -> None:
+        self.spans: Deque[Span] = deque(maxlen=size)
+        # Least recently used threads are forgotten first, once there are as many
+        # of them as there are spans in the buffer
+        self.thread_names: "OrderedDict[int, str]" = OrderedDict()
+        self._task_ids: "weakref.WeakKeyDictionary[asyncio.Task, int]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._next_thread_id = 1
+        self._trace_config: Optional[aiohttp.TraceConfig] = None
+
+    def _get_thread_id(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return 0
+
+        thread_names = self.thread_names
+        try:
+            thread_id = self._task_ids[task]
+        except KeyError:
+            thread_id = self._next_thread_id
+            self._next_thread_id += 1
+            self._task_ids[task] = thread_id
+        else:
+            if thread_id in thread_names:
+                thread_names.move_to_end(thread_id)
+                return thread_id
+
+        if len(thread_names) >= self.spans.maxlen:
+            thread_names.popitem(last=False)
+        thread_names[thread_id] = task.get_name()
+        return thread_id
+
+    def record(
+        self,
+        name: str,
+        category: str,
+        started_at: int,
+        args: Optional[Dict[str, Any]] = None,
+        thread_id: Optional[int] = None,
+    ) -> None:
+        if thread_id is None:
+            thread_id = self._get_thread_id()
+        self.spans.append(
+            (name, category, started_at, _now_us() - started_at, thread_id, args)
+        )
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Record the enclosed code as a span; yielded arguments may be amended"""
+        thread_id = self._get_thread_id()
+        started_at = _now_us()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = repr(e)
+            raise
+        finally:
+            self.record(name, category, started_at, args or None, thread_id)
+
+    @property
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Client session trace configuration, which records HTTP requests as spans"""
+        if self._trace_config is None:
+            self._trace_config = self._make_trace_config()
+        return self._trace_config
+
+    def _make_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def _on_request_start(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestStartParams,
+        ) -> None:
+            context.started_at = _now_us()
+            context.thread_id = self._get_thread_id()
+
+        def _finish(context: SimpleNamespace, params: Any, **args: Any) -> None:
+            if not hasattr(context, "started_at"):
+                return
+            url = params.url
+            # Session token is passed within query, hence only the action is recorded
+            name = url.query.get("query") or url.query.get("action") or url.path
+            self.record(
+                name,
+                "http",
+                context.started_at,
+                {"method": params.method, "host": url.host, **args},
+                context.thread_id,
+            )
+
+        async def _on_request_end(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestEndParams,
+        ) -> None:
+            _finish(context, params, status=params.response.status)
+
+        async def _on_request_exception(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestExceptionParams,
+        ) -> None:
+            _finish(context, params, error=repr(params.exception))
+
+        trace_config.on_request_start.append(_on_request_start)
+        trace_config.on_request_end.append(_on_request_end)
+        trace_config.on_request_exception.append(_on_request_exception)
+
+        return trace_config
+
+    def make_trace_events(self, pid: int, process_name: str) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": process_name},
+            }
+        ]
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self.thread_names.items()
+        )
+        for name, category, started_at, duration, tid, args in self.spans:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": started_at,
+                "dur": duration,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+
+def make_trace_events(recorders: Iterable[Tuple[str, SpanRecorder]]) -> Dict[str, Any]:
+    """Chrome trace event JSON object, with a process per (named) recorder"""
+    events: List[Dict[str, Any]] = []
+    for pid, (process_name, recorder) in enumerate(recorders, start=1):
+        events.extend(recorder.make_trace_events(pid, process_name))
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def save_trace_events(filename: str, trace_events: Dict[str, Any]) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(trace_events, f, ensure_ascii=False, default=str)
+
+
+def get_api_recorder(api: "BaseEnergosbytAPI") -> Optional[SpanRecorder]:
+    api_state = get_api_state(api)
+    return None if api_state is None else api_state.recorder
+
+
+@contextmanager
+def trace_span(
+    api: "BaseEnergosbytAPI", name: str, category: str, **args: Any
+) -> Iterator[Optional[Dict[str, Any]]]:
+    """Record the enclosed code as a span, if tracing is enabled for API object"""
+    recorder = get_api_recorder(api)
+    if recorder is None:
+        yield None
+        return
+
+    with recorder.span(name, category, **args) as span_args:
+        yield span_args
@@ -1,33 +1,59 @@
 import asyncio
 import datetime
+import logging
 import re
+import time
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import timedelta
+from functools import lru_cache
+from string import Formatter
 from typing import (
     Any,
     Callable,
     Coroutine,
     Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
     Optional,
     Set,
     TYPE_CHECKING,
+    Tuple,
     Type,
     TypeVar,
     Union,
 )
 
+import aiohttp
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_TYPE, CONF_USERNAME
 from homeassistant.core import callback
 from homeassistant.helpers.entity_platform import EntityPlatform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
-from custom_components.lkcomu_interrao.const import DOMAIN
+from custom_components.lkcomu_interrao._metrics import (
+    PHASE_AUTH,
+    get_api_metrics,
+    trace_phase,
+)
+from custom_components.lkcomu_interrao._state import AuthState, get_api_state
+from custom_components.lkcomu_interrao.const import (
+    DATA_PROVIDER_LOGOS_CACHE,
+    DOMAIN,
+    FORMAT_VARS,
+)
 from inter_rao_energosbyt.enums import ProviderType
 from inter_rao_energosbyt.exceptions import EnergosbytException
 
 if TYPE_CHECKING:
-    from inter_rao_energosbyt.interfaces import BaseEnergosbytAPI
+    from inter_rao_energosbyt.interfaces import Account, BaseEnergosbytAPI
+
+_LOGGER = logging.getLogger(__name__)
 
 
 def _make_log_prefix(
@@ -53,41 +79,353 @@ def _find_existing_entry(
 ) -> Optional[config_entries.ConfigEntry]:
     existing_entries = hass.config_entries.async_entries(DOMAIN)
     for config_entry in existing_entries:
-        if config_entry.data[CONF_TYPE] == type_ and config_entry.data[CONF_USERNAME] == username:
+        if (
+            config_entry.data[CONF_TYPE] == type_
+            and config_entry.data[CONF_USERNAME] == username
+        ):
             return config_entry
 
 
 def import_api_cls(type_: str) -> Type["BaseEnergosbytAPI"]:
-    return __import__("inter_rao_energosbyt.api." + type_, globals(), locals(), ("API",)).API
+    return __import__(
+        "inter_rao_energosbyt.api." + type_, globals(), locals(), ("API",)
+    ).API
 
 
 _RE_USERNAME_MASK = re.compile(r"^(\W*)(.).*(.)$")
 
 
-def mask_username(username: str):
+@lru_cache(maxsize=1024)
+def mask_username(username: str) -> str:
     parts = username.split("@")
     return "@".join(map(lambda x: _RE_USERNAME_MASK.sub(r"\1\2***\3", x), parts))
 
 
-_RE_FAVICON = re.compile(r'["\']?REACT_APP_FAVICON["\']?\s*:\s*"([\w.]+\.ico)"')
+# ASCII letters would be collapsed along with the rest of word characters anyway
+_DEV_PRESENTATION_DIGITS = str.maketrans("0123456789", "#" * 10)
+_RE_DEV_PRESENTATION_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1024)
+def mask_dev_presentation(value: str) -> str:
+    """Mask value for screenshots: digits become `#`, other words become `*`"""
+    return _RE_DEV_PRESENTATION_WORD.sub("*", value.translate(_DEV_PRESENTATION_DIGITS))
+
+
+_NAME_FORMAT_MODIFIERS: Dict[str, Callable[[str], str]] = {
+    "_upper": str.upper,
+    "_cap": str.capitalize,
+    "_title": str.title,
+}
+
+
+class NameFormat(str):
+    """Entity name template, parsed once upon creation.
+
+    Variables may carry `_upper`, `_cap` or `_title` suffix to transform their
+    value. Unknown variables (as well as invalid syntax) raise `ValueError`.
+    """
+
+    def __new__(
+        cls, template: str, known_vars: Iterable[str] = FORMAT_VARS
+    ) -> "NameFormat":
+        self = super().__new__(cls, template)
+        known_vars = frozenset(known_vars)
+
+        parts: List[
+            Tuple[str, Optional[str], Optional[Callable[[str], str]], str, str]
+        ] = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if field_name is None:
+                parts.append((literal, None, None, "", ""))
+                continue
+
+            var, modifier = field_name, None
+            if var not in known_vars:
+                for suffix, suffix_modifier in _NAME_FORMAT_MODIFIERS.items():
+                    if var.endswith(suffix) and var[: -len(suffix)] in known_vars:
+                        var, modifier = var[: -len(suffix)], suffix_modifier
+                        break
+                else:
+                    raise ValueError(f"unknown variable: {field_name}")
+
+            if format_spec and "{" in format_spec:
+                raise ValueError(f"nested variables are not supported: {field_name}")
+
+            parts.append((literal, var, modifier, format_spec or "", conversion or ""))
+
+        self.parts = tuple(parts)
+        return self
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Substitute variables, leaving absent ones as written in the template"""
+        chunks = []
+        for literal, var, modifier, format_spec, conversion in self.parts:
+            chunks.append(literal)
+            if var is None:
+                continue
+
+            try:
+                value = values[var]
+            except KeyError:
+                chunks.append("{" + var + "}")
+                continue
+
+            if modifier is not None:
+                value = modifier(value)
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            chunks.append(format(value, format_spec) if format_spec else value)
+
+        return "".join(chunks)
+
+
+_RE_FAVICON = re.compile(rb'["\']?REACT_APP_FAVICON["\']?\s*:\s*"([\w.]+\.ico)"')
+_FAVICON_SCAN_CHUNK_SIZE = 64 * 1024
+_FAVICON_SCAN_OVERLAP = 256
+
+
+async def _async_scan_favicon(response: aiohttp.ClientResponse) -> Optional[str]:
+    """Search response body for favicon path, and stop reading as soon as it is found.
+
+    Every chunk is searched together with the tail of preceding data, so that
+    matches spanning chunk boundaries are not missed.
+    """
+    tail = b""
+    async for chunk in response.content.iter_chunked(_FAVICON_SCAN_CHUNK_SIZE):
+        data = tail + chunk
+        m = _RE_FAVICON.search(data)
+        if m:
+            return m.group(1).decode()
+        tail = data[-_FAVICON_SCAN_OVERLAP:]
+
+    return None
 
-ICONS_FOR_PROVIDERS: Dict[str, Optional[Union[asyncio.Future, str]]] = {}
+
+_LOGOS_STORAGE_VERSION = 1
+_LOGOS_STORAGE_KEY = DOMAIN + ".provider_logos"
+_LOGOS_SAVE_DELAY = 10  # seconds
+LOGOS_CACHE_TTL = timedelta(days=1)
 
 
 def _make_code_search_index(code):
     return tuple(map(str.lower, (code + "Logo", "defaultMarker" + code)))
 
 
+class _SubstringMatcher:
+    """Find all words occurring within a string in a single regular expression pass.
+
+    Alternatives are ordered longest first inside a lookahead, so every position
+    yields the longest word starting there. Other words starting at the same
+    position are its prefixes, and are resolved from precomputed prefix sets.
+    """
+
+    __slots__ = ("_pattern", "_prefixes")
+
+    def __init__(self, words: Iterable[str]) -> None:
+        words = sorted(set(words), key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))")
+        self._prefixes = {
+            word: tuple(prefix for prefix in words if word.startswith(prefix))
+            for word in words
+        }
+
+    def find_all(self, value: str) -> Set[str]:
+        found = set()
+        for match in self._pattern.finditer(value):
+            found.update(self._prefixes[match.group(1)])
+        return found
+
+
+_PROVIDER_CODES = tuple(provider_type.name.lower() for provider_type in ProviderType)
+
+
+def _make_logo_needle_owners() -> Dict[str, Tuple[str, ...]]:
+    needle_owners: Dict[str, Set[str]] = {}
+    for code in _PROVIDER_CODES:
+        search_index = _make_code_search_index(code)
+        if "_" in code:
+            root_code = code.split("_")[0]
+            search_index = (*search_index, *_make_code_search_index(root_code))
+        for needle in search_index:
+            needle_owners.setdefault(needle, set()).add(code)
+    return {needle: tuple(sorted(owners)) for needle, owners in needle_owners.items()}
+
+
+_LOGO_NEEDLE_OWNERS = _make_logo_needle_owners()
+_LOGO_NEEDLES_MATCHER = _SubstringMatcher(_LOGO_NEEDLE_OWNERS)
+_LOGO_EXTENSIONS = (".png", ".jpg", ".svg")
+
+
+def find_provider_logos(manifest: Mapping[str, Any]) -> Dict[str, str]:
+    """Resolve logo paths for all known provider codes in a single pass over manifest.
+
+    A key containing `<code>Logo` or `defaultMarker<code>` (of the provider
+    code, or of its root code) takes precedence, with the last such key winning.
+    Otherwise, the first image key containing provider code is used.
+    """
+    logos: Dict[str, str] = {}
+    image_keys: List[str] = []
+    image_paths: List[str] = []
+
+    for key, path in manifest.items():
+        if not isinstance(path, str):
+            continue
+
+        lower_key = key.lower()
+        # Every needle contains one of the anchors, which are cheap to look for
+        if "logo" in lower_key or "defaultmarker" in lower_key:
+            for needle in _LOGO_NEEDLES_MATCHER.find_all(lower_key):
+                for code in _LOGO_NEEDLE_OWNERS[needle]:
+                    logos[code] = path
+
+        if lower_key.endswith(_LOGO_EXTENSIONS):
+            image_keys.append(key)
+            image_paths.append(path)
+
+    missing_codes = [code for code in _PROVIDER_CODES if code not in logos]
+    if missing_codes and image_keys:
+        # First image key containing the code is found with a single search
+        # over joined keys, and mapped back through key start offsets.
+        joined_keys = "\n".join(image_keys)
+        key_offsets = [0]
+        for key in image_keys[:-1]:
+            key_offsets.append(key_offsets[-1] + len(key) + 1)
+
+        for code in missing_codes:
+            position = joined_keys.find(code)
+            if position >= 0:
+                logos[code] = image_paths[bisect_right(key_offsets, position) - 1]
+
+    return logos
+
+
+class ProviderLogosCache:
+    """Provider logos resolved from frontend assets (manifest and `main.js` favicon).
+
+    Results are cached per API base URL and persisted across restarts. Upon
+    expiry, the manifest is revalidated with conditional requests, and the
+    `main.js` bundle is downloaded again only when the manifest points at
+    a different one.
+    """
+
+    __slots__ = ("_store", "_entries")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store = Store(hass, _LOGOS_STORAGE_VERSION, _LOGOS_STORAGE_KEY)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if data:
+            self._entries = dict(data.get("entries") or {})
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {"entries": self._entries}
+
+    async def async_get_entry(self, api: "BaseEnergosbytAPI") -> Dict[str, Any]:
+        base_url = api.BASE_URL
+        entry = self._entries.get(base_url)
+        now = dt_util.utcnow().timestamp()
+
+        if (
+            entry is not None
+            and now - entry["fetched_at"] < LOGOS_CACHE_TTL.total_seconds()
+        ):
+            return entry
+
+        try:
+            entry = await self._async_fetch_entry(api, entry)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            if entry is None:
+                raise
+            # Outdated assets are still better than no logos at all
+            return entry
+
+        entry["fetched_at"] = now
+        self._entries[base_url] = entry
+        self._store.async_delay_save(self._data_to_save, _LOGOS_SAVE_DELAY)
+        return entry
+
+    @staticmethod
+    async def _async_fetch_entry(
+        api: "BaseEnergosbytAPI", entry: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        session = api._session
+        base_url = api.BASE_URL
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers[aiohttp.hdrs.IF_NONE_MATCH] = entry["etag"]
+            if entry.get("last_modified"):
+                headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = entry["last_modified"]
+
+        async with session.get(
+            base_url + "/asset-manifest.json", headers=headers
+        ) as response:
+            if response.status == 304 and entry is not None:
+                entry = dict(entry)
+            else:
+                response.raise_for_status()
+                manifest = await response.json()
+                entry = {
+                    "logos": find_provider_logos(manifest),
+                    "etag": response.headers.get(aiohttp.hdrs.ETAG),
+                    "last_modified": response.headers.get(aiohttp.hdrs.LAST_MODIFIED),
+                    "main_js": manifest.get("main.js"),
+                    "favicon_source": (entry or {}).get("favicon_source"),
+                    "favicon": (entry or {}).get("favicon"),
+                }
+
+        # Bundle names are content-hashed, so the favicon is searched anew only
+        # when manifest points at a different bundle.
+        main_js = entry.get("main_js")
+        if main_js != entry["favicon_source"]:
+            favicon = None
+            try:
+                if main_js is not None:
+                    async with session.get(base_url + "/" + main_js) as response:
+                        response.raise_for_status()
+                        favicon = await _async_scan_favicon(response)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Previous favicon is kept, and the bundle is scanned on next refresh
+                _LOGGER.debug("Could not scan %s for favicon: %r", main_js, e)
+            else:
+                entry["favicon_source"] = main_js
+                entry["favicon"] = favicon
+
+        return entry
+
+
+async def _async_load_provider_logos_cache(hass: HomeAssistant) -> ProviderLogosCache:
+    logos_cache = ProviderLogosCache(hass)
+    await logos_cache.async_load()
+    hass.data[DATA_PROVIDER_LOGOS_CACHE] = logos_cache
+    return logos_cache
+
+
 async def async_get_icons_for_providers(
-    api: "BaseEnergosbytAPI", provider_types: Set[int]
+    hass: HomeAssistant, api: "BaseEnergosbytAPI", provider_types: Set[int]
 ) -> Dict[str, str]:
-    session = api._session
+    logos_cache: Optional[ProviderLogosCache] = hass.data.get(DATA_PROVIDER_LOGOS_CACHE)
+    if logos_cache is None:
+        logos_cache = await async_single_flight(
+            DATA_PROVIDER_LOGOS_CACHE, _async_load_provider_logos_cache, hass
+        )
+
+    # Entries against the same host share a single fetch
+    entry = await async_single_flight(
+        (DATA_PROVIDER_LOGOS_CACHE, api.BASE_URL), logos_cache.async_get_entry, api
+    )
+
     base_url = api.BASE_URL
+    logos: Dict[str, str] = entry["logos"]
     icons = {}
 
-    async with session.get(base_url + "/asset-manifest.json") as response:
-        manifest = await response.json()
-
     iter_types = []
 
     for provider_type in provider_types:
@@ -97,43 +435,21 @@ async def async_get_icons_for_providers(
             continue
         else:
             iter_types.append(code)
-
-    for code in iter_types:
-        search_index = _make_code_search_index(code)
-        if "_" in code:
-            root_code = code.split("_")[0]
-            search_index = (*search_index, *_make_code_search_index(root_code))
-        for key in manifest:
-            lower_key = key.lower()
-            for index_key in search_index:
-                if index_key in lower_key:
-                    icons[code] = base_url + "/" + manifest[key]
-                    break
-
-            if (
-                code not in icons
-                and code in key
-                and (
-                    lower_key.endswith(".png")
-                    or lower_key.endswith(".jpg")
-                    or lower_key.endswith(".svg")
-                )
-            ):
-                icons[code] = base_url + "/" + manifest[key]
+            if code in logos:
+                icons[code] = base_url + "/" + logos[code]
 
     # Diversion for ProviderType.TKO
-    if ProviderType.TKO.name.lower() not in icons and ProviderType.MES.name.lower() in icons:
+    if (
+        ProviderType.TKO.name.lower() not in icons
+        and ProviderType.MES.name.lower() in icons
+    ):
         icons[ProviderType.TKO.name.lower()] = icons[ProviderType.MES.name.lower()]
 
-    if "main.js" in manifest:
-        async with session.get(base_url + "/" + manifest["main.js"]) as response:
-            js_code = await response.text()
-
-        m = _RE_FAVICON.search(js_code)
-        if m:
-            url = base_url + "/" + m.group(1)
-            for code in iter_types:
-                icons.setdefault(code, url)
+    favicon = entry["favicon"]
+    if favicon:
+        url = base_url + "/" + favicon
+        for code in iter_types:
+            icons.setdefault(code, url)
 
     return icons
 
@@ -141,16 +457,283 @@ async def async_get_icons_for_providers(
 LOCAL_TIMEZONE = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
 
 # Kaliningrad is excluded as it is not supported
-IS_IN_RUSSIA = timedelta(hours=3) <= LOCAL_TIMEZONE.utcoffset(None) <= timedelta(hours=12)
+IS_IN_RUSSIA = (
+    timedelta(hours=3) <= LOCAL_TIMEZONE.utcoffset(None) <= timedelta(hours=12)
+)
 _T = TypeVar("_T")
 _RT = TypeVar("_RT")
 
 
+def _get_auth_state(api: "BaseEnergosbytAPI") -> AuthState:
+    api_state = get_api_state(api)
+    # API objects of config flows are not set up, and need no serialization
+    return AuthState() if api_state is None else api_state.auth
+
+
+async def async_reauthenticate(
+    api: "BaseEnergosbytAPI", generation: Optional[int] = None
+) -> None:
+    """Authenticate API object, serializing concurrent attempts.
+
+    Callers that pass the session generation they have failed on will skip
+    authentication if another caller has already performed it in the meantime.
+    """
+    auth_state = _get_auth_state(api)
+
+    async with auth_state.lock:
+        if generation is not None and generation != auth_state.generation:
+            return
+
+        metrics = get_api_metrics(api)
+        try:
+            with trace_phase(PHASE_AUTH):
+                await api.async_authenticate()
+        except Exception:
+            if metrics is not None:
+                metrics.record_reauth(failed=True)
+            raise
+        else:
+            if metrics is not None:
+                metrics.record_reauth()
+        finally:
+            # Failed attempts also advance generation, so that waiting callers
+            # do not repeat the login against an unresponsive provider.
+            auth_state.generation += 1
+
+
+async def async_record_call(
+    api: "BaseEnergosbytAPI",
+    endpoint: str,
+    async_getter: Callable[..., Coroutine[Any, Any, _RT]],
+    *args,
+    **kwargs,
+) -> _RT:
+    """Call provider method, recording the call under `endpoint` in API metrics"""
+    metrics = get_api_metrics(api)
+    if metrics is None:
+        return await async_getter(*args, **kwargs)
+
+    started_at = time.monotonic()
+    try:
+        result = await async_getter(*args, **kwargs)
+    except Exception:
+        metrics.record_call(endpoint, time.monotonic() - started_at, failed=True)
+        raise
+    metrics.record_call(endpoint, time.monotonic() - started_at)
+    return result
+
+
 async def with_auto_auth(
-    api: "BaseEnergosbytAPI", async_getter: Callable[..., Coroutine[Any, Any, _RT]], *args, **kwargs
+    api: "BaseEnergosbytAPI",
+    async_getter: Callable[..., Coroutine[Any, Any, _RT]],
+    *args,
+    endpoint: Optional[str] = None,
+    **kwargs,
 ) -> _RT:
+    """Call method, authenticating again once the session has expired.
+
+    When `endpoint` is given, `async_getter` is a provider call to be recorded
+    in metrics (every attempt separately); otherwise, provider calls made by
+    `async_getter` are expected to be recorded by itself.
+    """
+    if endpoint is not None:
+        args = (api, endpoint, async_getter, *args)
+        async_getter = async_record_call
+
+    generation = _get_auth_state(api).generation
     try:
         return await async_getter(*args, **kwargs)
     except EnergosbytException:
-        await api.async_authenticate()
+        await async_reauthenticate(api, generation)
         return await async_getter(*args, **kwargs)
+
+
+# Key: (shared task, completion time, expiry time of the stored result)
+_SINGLE_FLIGHT_CALLS: Dict[
+    Hashable, Tuple["asyncio.Task", Optional[float], Optional[float]]
+] = {}
+
+
+async def async_single_flight(
+    key: Hashable,
+    async_getter: Callable[..., Coroutine[Any, Any, _RT]],
+    *args,
+    result_window: float = 0.0,
+    **kwargs,
+) -> _RT:
+    """Share a single in-flight call of `async_getter` between concurrent callers.
+
+    Callers awaiting the same `key` receive the result of one underlying call.
+    Successful results are additionally served for `result_window` seconds after
+    completion. Every stored result expires according to the window it was stored
+    with, regardless of windows of later callers.
+    """
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+
+    existing = _SINGLE_FLIGHT_CALLS.get(key)
+    if existing is not None:
+        task, completed_at, expires_at = existing
+        if completed_at is None or (
+            now <= expires_at and now - completed_at <= result_window
+        ):
+            return await asyncio.shield(task)
+
+    # Drop results that outlived their own window
+    for expired_key in [
+        call_key
+        for call_key, (_, _, expires_at) in _SINGLE_FLIGHT_CALLS.items()
+        if expires_at is not None and now > expires_at
+    ]:
+        del _SINGLE_FLIGHT_CALLS[expired_key]
+
+    task = loop.create_task(async_getter(*args, **kwargs))
+    _SINGLE_FLIGHT_CALLS[key] = (task, None, None)
+
+    def _on_done(_) -> None:
+        if _SINGLE_FLIGHT_CALLS.get(key, (None,))[0] is not task:
+            return
+
+        if result_window > 0 and not task.cancelled() and task.exception() is None:
+            completed_at = loop.time()
+            _SINGLE_FLIGHT_CALLS[key] = (
+                task,
+                completed_at,
+                completed_at + result_window,
+            )
+        else:
+            del _SINGLE_FLIGHT_CALLS[key]
+
+    task.add_done_callback(_on_done)
+
+    return await asyncio.shield(task)
+
+
+def single_flight_forget(key: Hashable, task: Optional["asyncio.Task"] = None) -> None:
+    """Drop shared call (or stored result) for `key`, optionally only if it is `task`"""
+    existing = _SINGLE_FLIGHT_CALLS.get(key)
+    if existing is not None and (task is None or existing[0] is task):
+        del _SINGLE_FLIGHT_CALLS[key]
+
+
+RESPONSE_CACHE_MIN_ENTRIES = 64
+
+
+class _ResponseCache:
+    """Results of read-only account calls, with per-endpoint TTL and LRU eviction.
+
+    The cache holds at most one entry per endpoint for every account of the API
+    object (but no less than `RESPONSE_CACHE_MIN_ENTRIES`), so that eviction only
+    ever drops entries of accounts that are no longer in use.
+    """
+
+    __slots__ = ("ttls", "generation", "entries")
+
+    def __init__(self, ttls: Mapping[str, timedelta]) -> None:
+        self.ttls: Dict[str, float] = {
+            endpoint: ttl.total_seconds() for endpoint, ttl in ttls.items()
+        }
+        # Advanced on invalidation, so that results of calls that were in flight
+        # at the time of invalidation do not get stored.
+        self.generation = 0
+        self.entries: "OrderedDict[Tuple[Any, str], Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Tuple[Any, str], now: float) -> Tuple[bool, Any]:
+        try:
+            expires_at, result = self.entries[key]
+        except KeyError:
+            return False, None
+
+        if expires_at <= now:
+            del self.entries[key]
+            return False, None
+
+        self.entries.move_to_end(key)
+        return True, result
+
+    def set(
+        self, key: Tuple[Any, str], result: Any, now: float, accounts_count: int
+    ) -> None:
+        entries = self.entries
+        entries[key] = (now + self.ttls[key[1]], result)
+        entries.move_to_end(key)
+        max_entries = max(RESPONSE_CACHE_MIN_ENTRIES, accounts_count * len(self.ttls))
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+
+
+def configure_response_cache(
+    api: "BaseEnergosbytAPI", ttls: Mapping[str, timedelta]
+) -> None:
+    """Enable caching of calls made via `async_cached_account_call` for API object"""
+    get_api_state(api).response_cache = _ResponseCache(ttls)
+
+
+def _get_response_cache(api: "BaseEnergosbytAPI") -> Optional[_ResponseCache]:
+    api_state = get_api_state(api)
+    return None if api_state is None else api_state.response_cache
+
+
+async def async_cached_account_call(
+    account: "Account",
+    endpoint: str,
+    async_getter: Callable[..., Coroutine[Any, Any, _RT]],
+    *args,
+    **kwargs,
+) -> _RT:
+    """Call read-only account method, serving its result from cache within endpoint TTL.
+
+    Concurrent cache misses share a single underlying call.
+    """
+    with trace_phase(endpoint, account=mask_username(account.code)):
+        return await _async_cached_account_call(
+            account, endpoint, async_getter, *args, **kwargs
+        )
+
+
+async def _async_cached_account_call(
+    account: "Account",
+    endpoint: str,
+    async_getter: Callable[..., Coroutine[Any, Any, _RT]],
+    *args,
+    **kwargs,
+) -> _RT:
+    api = account.api
+    cache = _get_response_cache(api)
+    if cache is None or cache.ttls.get(endpoint, 0) <= 0:
+        return await async_record_call(api, endpoint, async_getter, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    key = (account, endpoint)
+
+    hit, result = cache.get(key, loop.time())
+    if hit:
+        return result
+
+    generation = cache.generation
+    result = await async_single_flight(
+        ("response", *key),
+        async_record_call,
+        api,
+        endpoint,
+        async_getter,
+        *args,
+        **kwargs,
+    )
+    if cache.generation == generation:
+        cache.set(key, result, loop.time(), len(api.accounts or ()))
+
+    return result
+
+
+def invalidate_account_cache(account: "Account", *endpoints: str) -> None:
+    """Drop cached results of account calls (of given endpoints, or all of them)"""
+    cache = _get_response_cache(account.api)
+    if cache is None:
+        return
+
+    cache.generation += 1
+    for endpoint in endpoints or tuple(cache.ttls):
+        key = (account, endpoint)
+        cache.entries.pop(key, None)
+        single_flight_forget(("response", *key))
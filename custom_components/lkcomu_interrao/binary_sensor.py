@@ -1,4 +1,14 @@
-from typing import Any, ClassVar, Dict, Hashable, Iterable, Mapping, Optional, Type, TypeVar
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Type,
+    TypeVar,
+)
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -15,19 +25,25 @@ from custom_components.lkcomu_interrao._base import (
     make_common_async_setup_entry,
 )
 from custom_components.lkcomu_interrao._encoders import payment_to_attrs
+from custom_components.lkcomu_interrao._util import async_cached_account_call
 from custom_components.lkcomu_interrao.const import (
     ATTR_AGENT,
     ATTR_AMOUNT,
     ATTR_GROUP,
     ATTR_PAID_AT,
     ATTR_PERIOD,
+    CACHE_ENDPOINT_LAST_PAYMENT,
     CONF_LAST_PAYMENT,
     DOMAIN,
     FORMAT_VAR_ID,
     FORMAT_VAR_TYPE_EN,
     FORMAT_VAR_TYPE_RU,
 )
-from inter_rao_energosbyt.interfaces import AbstractAccountWithPayments, AbstractPayment, Account
+from inter_rao_energosbyt.interfaces import (
+    AbstractAccountWithPayments,
+    AbstractPayment,
+    Account,
+)
 
 _TLkcomuInterRAOEntity = TypeVar("_TLkcomuInterRAOEntity", bound=LkcomuInterRAOEntity)
 
@@ -37,7 +53,9 @@ class LkcomuInterRAOLastPayment(
 ):
     config_key: ClassVar[str] = CONF_LAST_PAYMENT
 
-    def __init__(self, *args, last_payment: Optional[AbstractPayment] = None, **kwargs) -> None:
+    def __init__(
+        self, *args, last_payment: Optional[AbstractPayment] = None, **kwargs
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._last_payment = last_payment
 
@@ -81,12 +99,15 @@ class LkcomuInterRAOLastPayment(
                 return [entity]
             else:
                 if entity.enabled:
-                    await entity.async_update_ha_state(force_refresh=True)
+                    await entity.async_update_ha_state_if_changed()
 
         return None
 
     async def async_update_internal(self) -> None:
-        self._last_payment = await self._account.async_get_last_payment()
+        account = self._account
+        self._last_payment = await async_cached_account_call(
+            account, CACHE_ENDPOINT_LAST_PAYMENT, account.async_get_last_payment
+        )
 
     #################################################################################
     # Data-oriented implementation of inherent class
@@ -119,7 +140,9 @@ class LkcomuInterRAOLastPayment(
 
             attributes = payment_to_attrs(payment)
             self._handle_dev_presentation(
-                attributes, (ATTR_PAID_AT, ATTR_PERIOD), (ATTR_AMOUNT, ATTR_AGENT, ATTR_GROUP)
+                attributes,
+                (ATTR_PAID_AT, ATTR_PERIOD),
+                (ATTR_AMOUNT, ATTR_AGENT, ATTR_GROUP),
             )
 
         return attributes
@@ -133,8 +156,7 @@ class LkcomuInterRAOLastPayment(
             FORMAT_VAR_TYPE_RU: "последний платёж",
         }
 
-    @property
-    def unique_id(self) -> str:
+    def make_unique_id(self) -> str:
         """Return the unique ID of the sensor"""
         acc = self._account
         return f"{acc.api.__class__.__name__}_lastpayment_{acc.id}"
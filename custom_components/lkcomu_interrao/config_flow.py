@@ -19,6 +19,7 @@ from typing import (
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import (
     CONF_DEFAULT,
@@ -31,7 +32,7 @@ from homeassistant.const import (
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from custom_components.lkcomu_interrao._util import import_api_cls
+from custom_components.lkcomu_interrao._util import IS_IN_RUSSIA, import_api_cls
 from custom_components.lkcomu_interrao.const import (
     API_TYPE_DEFAULT,
     API_TYPE_NAMES,
@@ -85,6 +86,7 @@ class LkcomuInterRAOConfigFlow(ConfigFlow, domain=DOMAIN):
         self._current_config: Optional[ConfigType] = None
         self._devices_info = None
         self._accounts: Optional[Mapping[int, "Account"]] = None
+        self._reauth_entry: Optional[ConfigEntry] = None
 
         self.schema_user = None
 
@@ -215,6 +217,76 @@ class LkcomuInterRAOConfigFlow(ConfigFlow, domain=DOMAIN):
             data=_flatten(current_config),
         )
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Handle credentials being rejected by the provider."""
+        config_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        self._reauth_entry = config_entry
+
+        if config_entry.source == config_entries.SOURCE_IMPORT:
+            # Credentials of YAML entries may only be changed within YAML
+            persistent_notification.async_create(
+                self.hass,
+                (
+                    "Ошибка авторизации для %s. Обновите пароль в YAML."
+                    if IS_IN_RUSSIA
+                    else "Authentication failed for %s. Update password in YAML."
+                )
+                % config_entry.title,
+                title="Inter RAO",
+                notification_id=f"{DOMAIN}_reauth_{config_entry.entry_id}",
+            )
+            return self.async_abort(reason="reauth_yaml_not_supported")
+
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: Optional[ConfigType] = None
+    ) -> Dict[str, Any]:
+        config_entry = self._reauth_entry
+        schema_reauth = vol.Schema({vol.Required(CONF_PASSWORD): str})
+        description_placeholders = {CONF_USERNAME: config_entry.data[CONF_USERNAME]}
+
+        if user_input is None:
+            return self.async_show_form(
+                step_id="reauth_confirm",
+                data_schema=schema_reauth,
+                description_placeholders=description_placeholders,
+            )
+
+        try:
+            api_cls = import_api_cls(config_entry.data[CONF_TYPE])
+        except (ImportError, AttributeError):
+            _LOGGER.error(
+                "Could not find API type: %s", config_entry.data[CONF_TYPE]
+            )
+            return self.async_abort(reason="api_load_error")
+
+        async with api_cls(
+            username=config_entry.data[CONF_USERNAME],
+            password=user_input[CONF_PASSWORD],
+            user_agent=config_entry.data.get(CONF_USER_AGENT) or DEFAULT_USER_AGENT,
+        ) as api:
+            try:
+                await api.async_authenticate()
+
+            except EnergosbytException as e:
+                _LOGGER.error(f"Authentication error: {repr(e)}")
+                return self.async_show_form(
+                    step_id="reauth_confirm",
+                    data_schema=schema_reauth,
+                    description_placeholders=description_placeholders,
+                    errors={"base": "authentication_error"},
+                )
+
+        self.hass.config_entries.async_update_entry(
+            config_entry,
+            data={**config_entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]},
+        )
+        self.hass.async_create_task(
+            self.hass.config_entries.async_reload(config_entry.entry_id)
+        )
+        return self.async_abort(reason="reauth_successful")
+
     async def async_step_import(self, user_input: Optional[ConfigType] = None) -> Dict[str, Any]:
         if user_input is None:
             return self.async_abort(reason="unknown_error")
@@ -1,4 +1,5 @@
 """Constants for lkcomu_interrao integration"""
+
 from typing import Final
 
 DOMAIN: Final = "lkcomu_interrao"
@@ -42,6 +43,7 @@ ATTR_METER_MODEL: Final = "meter_model"
 ATTR_MODEL: Final = "model"
 ATTR_PAID: Final = "paid"
 ATTR_PAID_AT: Final = "paid_at"
+ATTR_PATH: Final = "path"
 ATTR_PENALTY: Final = "penalty"
 ATTR_PERIOD: Final = "period"
 ATTR_PREVIOUS: Final = "previous"
@@ -53,6 +55,8 @@ ATTR_REMAINING_DAYS: Final = "remaining_days"
 ATTR_RESULT: Final = "result"
 ATTR_SERVICE_NAME: Final = "service_name"
 ATTR_SERVICE_TYPE: Final = "service_type"
+ATTR_SNAPSHOT_AT: Final = "snapshot_at"
+ATTR_STALE: Final = "stale"
 ATTR_START: Final = "start"
 ATTR_STATUS: Final = "status"
 ATTR_SUBMIT_PERIOD_ACTIVE: Final = "submit_period_active"
@@ -65,34 +69,69 @@ ATTR_TOTAL_AREA: Final = "total_area"
 ATTR_UNIT: Final = "unit"
 
 CONF_ACCOUNTS: Final = "accounts"
+CONF_ADAPTIVE_SCAN_INTERVAL: Final = "adaptive_scan_interval"
+CONF_BACKGROUND_SETUP: Final = "background_setup"
+CONF_CACHE_TTL: Final = "cache_ttl"
 CONF_DEV_PRESENTATION: Final = "dev_presentation"
+CONF_DIAGNOSTIC_SENSORS: Final = "diagnostic_sensors"
 CONF_LAST_INVOICE: Final = "last_invoice"
 CONF_LAST_PAYMENT: Final = "last_payment"
 CONF_LOGOS: Final = "logos"
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
+CONF_MAX_SCAN_INTERVAL: Final = "max_scan_interval"
 CONF_METERS: Final = "meters"
 CONF_NAME_FORMAT: Final = "name_format"
+CONF_SCAN_JITTER: Final = "scan_jitter"
+CONF_SNAPSHOT_MAX_AGE: Final = "snapshot_max_age"
+CONF_TRACING: Final = "tracing"
 CONF_USER_AGENT: Final = "user_agent"
 
 DATA_API_OBJECTS: Final = DOMAIN + "_api_objects"
+DATA_API_STATES: Final = DOMAIN + "_api_states"
+DATA_CONNECTION_POOLS: Final = DOMAIN + "_connection_pools"
 DATA_ENTITIES: Final = DOMAIN + "_entities"
 DATA_FINAL_CONFIG: Final = DOMAIN + "_final_config"
+DATA_HOST_LIMITERS: Final = DOMAIN + "_host_limiters"
 DATA_PROVIDER_LOGOS: Final = DOMAIN + "_provider_logos"
+DATA_PROVIDER_LOGOS_CACHE: Final = DOMAIN + "_provider_logos_cache"
+DATA_SNAPSHOTS: Final = DOMAIN + "_snapshots"
+DATA_UPDATE_COORDINATORS: Final = DOMAIN + "_update_coordinators"
 DATA_UPDATE_DELEGATORS: Final = DOMAIN + "_update_delegators"
 DATA_UPDATE_LISTENERS: Final = DOMAIN + "_update_listeners"
 DATA_YAML_CONFIG: Final = DOMAIN + "_yaml_config"
 
-DEFAULT_NAME_FORMAT_EN_ACCOUNTS: Final = "{provider_code_upper} {account_code} {type_en_cap}"
-DEFAULT_NAME_FORMAT_EN_METERS: Final = "{provider_code_upper} {account_code} {type_en_cap} {code}"
-DEFAULT_NAME_FORMAT_EN_LAST_INVOICE: Final = "{provider_code_upper} {account_code} {type_en_cap}"
-DEFAULT_NAME_FORMAT_EN_LAST_PAYMENT: Final = "{provider_code_upper} {account_code} {type_en_cap}"
+DEFAULT_NAME_FORMAT_EN_ACCOUNTS: Final = (
+    "{provider_code_upper} {account_code} {type_en_cap}"
+)
+DEFAULT_NAME_FORMAT_EN_METERS: Final = (
+    "{provider_code_upper} {account_code} {type_en_cap} {code}"
+)
+DEFAULT_NAME_FORMAT_EN_LAST_INVOICE: Final = (
+    "{provider_code_upper} {account_code} {type_en_cap}"
+)
+DEFAULT_NAME_FORMAT_EN_LAST_PAYMENT: Final = (
+    "{provider_code_upper} {account_code} {type_en_cap}"
+)
 
-DEFAULT_NAME_FORMAT_RU_ACCOUNTS: Final = "{provider_code_upper} {account_code} {type_ru_cap}"
-DEFAULT_NAME_FORMAT_RU_METERS: Final = "{provider_code_upper} {account_code} {type_ru_cap} {code}"
-DEFAULT_NAME_FORMAT_RU_LAST_INVOICE: Final = "{provider_code_upper} {account_code} {type_ru_cap}"
-DEFAULT_NAME_FORMAT_RU_LAST_PAYMENT: Final = "{provider_code_upper} {account_code} {type_ru_cap}"
+DEFAULT_NAME_FORMAT_RU_ACCOUNTS: Final = (
+    "{provider_code_upper} {account_code} {type_ru_cap}"
+)
+DEFAULT_NAME_FORMAT_RU_METERS: Final = (
+    "{provider_code_upper} {account_code} {type_ru_cap} {code}"
+)
+DEFAULT_NAME_FORMAT_RU_LAST_INVOICE: Final = (
+    "{provider_code_upper} {account_code} {type_ru_cap}"
+)
+DEFAULT_NAME_FORMAT_RU_LAST_PAYMENT: Final = (
+    "{provider_code_upper} {account_code} {type_ru_cap}"
+)
 
+DEFAULT_CACHE_TTL: Final = 30  # seconds
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 4
 DEFAULT_MAX_INDICATIONS: Final = 3
+DEFAULT_MAX_SCAN_INTERVAL: Final = 24 * 60 * 60  # 1 day
 DEFAULT_SCAN_INTERVAL: Final = 60 * 60  # 1 hour
+DEFAULT_SNAPSHOT_MAX_AGE: Final = 3 * 24 * 60 * 60  # 3 days
 
 API_TYPE_DEFAULT: Final = "moscow"
 API_TYPE_NAMES: Final = {
@@ -110,6 +149,17 @@ API_TYPE_NAMES: Final = {
 
 SUPPORTED_PLATFORMS: Final = ("sensor", "binary_sensor")
 
+CACHE_ENDPOINT_BALANCE: Final = "balance"
+CACHE_ENDPOINT_LAST_INVOICE: Final = "last_invoice"
+CACHE_ENDPOINT_LAST_PAYMENT: Final = "last_payment"
+CACHE_ENDPOINT_RELATED: Final = "related"
+CACHE_ENDPOINTS: Final = (
+    CACHE_ENDPOINT_BALANCE,
+    CACHE_ENDPOINT_LAST_INVOICE,
+    CACHE_ENDPOINT_LAST_PAYMENT,
+    CACHE_ENDPOINT_RELATED,
+)
+
 FORMAT_VAR_ACCOUNT_CODE: Final = "account_code"
 FORMAT_VAR_ACCOUNT_ID: Final = "account_id"
 FORMAT_VAR_CODE: Final = "code"
@@ -118,3 +168,14 @@ FORMAT_VAR_PROVIDER_CODE: Final = "provider_code"
 FORMAT_VAR_PROVIDER_NAME: Final = "provider_name"
 FORMAT_VAR_TYPE_EN: Final = "type_en"
 FORMAT_VAR_TYPE_RU: Final = "type_ru"
+
+FORMAT_VARS: Final = (
+    FORMAT_VAR_ACCOUNT_CODE,
+    FORMAT_VAR_ACCOUNT_ID,
+    FORMAT_VAR_CODE,
+    FORMAT_VAR_ID,
+    FORMAT_VAR_PROVIDER_CODE,
+    FORMAT_VAR_PROVIDER_NAME,
+    FORMAT_VAR_TYPE_EN,
+    FORMAT_VAR_TYPE_RU,
+)
@@ -0,0 +1,97 @@
+"""Diagnostics support for Inter RAO config entries"""
+
+from datetime import timedelta
+from typing import Any, Dict, Mapping, Optional, TYPE_CHECKING
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TYPE, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.lkcomu_interrao._util import mask_username
+from custom_components.lkcomu_interrao.const import (
+    CONF_ACCOUNTS,
+    DATA_API_STATES,
+    DATA_CONNECTION_POOLS,
+    DATA_ENTITIES,
+    DATA_FINAL_CONFIG,
+    DATA_UPDATE_COORDINATORS,
+)
+
+if TYPE_CHECKING:
+    from custom_components.lkcomu_interrao._coordinator import LkcomuInterRAOCoordinator
+    from custom_components.lkcomu_interrao._pool import ConnectionPool
+    from custom_components.lkcomu_interrao._state import ApiState
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Mapping):
+        return {key: _serialize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_serialize(item) for item in value]
+    return value
+
+
+def _redact_config(config: Mapping[str, Any]) -> Dict[str, Any]:
+    config = dict(config)
+
+    # Account codes are used as keys of account configurations
+    accounts = config.get(CONF_ACCOUNTS)
+    if isinstance(accounts, Mapping):
+        config[CONF_ACCOUNTS] = {
+            mask_username(str(code)): account_config
+            for code, account_config in accounts.items()
+        }
+
+    return async_redact_data(_serialize(config), TO_REDACT)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> Dict[str, Any]:
+    entry_id = config_entry.entry_id
+
+    final_config = hass.data.get(DATA_FINAL_CONFIG, {}).get(entry_id)
+    entities = hass.data.get(DATA_ENTITIES, {}).get(entry_id) or {}
+    coordinator: Optional["LkcomuInterRAOCoordinator"] = hass.data.get(
+        DATA_UPDATE_COORDINATORS, {}
+    ).get(entry_id)
+    api_state: Optional["ApiState"] = hass.data.get(DATA_API_STATES, {}).get(entry_id)
+    metrics = None if api_state is None else api_state.metrics
+    pool: Optional["ConnectionPool"] = hass.data.get(DATA_CONNECTION_POOLS, {}).get(
+        config_entry.data[CONF_TYPE]
+    )
+
+    return {
+        "entry": {
+            "type": config_entry.data[CONF_TYPE],
+            "data": _redact_config(config_entry.data),
+            "options": _redact_config(config_entry.options),
+        },
+        "final_config": None if final_config is None else _redact_config(final_config),
+        "entities": {
+            entity_cls.__name__: len(cls_entities)
+            for entity_cls, cls_entities in entities.items()
+        },
+        "coordinator": (
+            None
+            if coordinator is None
+            else {
+                "groups": coordinator.groups_count,
+                "state_writes": coordinator.state_writes,
+                "state_writes_skipped": coordinator.state_writes_skipped,
+                "state_writes_skip_ratio": round(
+                    coordinator.state_writes_skip_ratio, 4
+                ),
+            }
+        ),
+        "connection_pool": None if pool is None else pool.get_stats(),
+        "metrics": None if metrics is None else metrics.as_dict(),
+        "refresh_traces": (
+            [] if metrics is None else [trace.as_dict() for trace in metrics.traces]
+        ),
+    }
@@ -2,46 +2,70 @@
 Sensor for Inter RAO cabinet.
 Retrieves indications regarding current state of accounts.
 """
+
 import logging
 import re
-from datetime import date, datetime
+from calendar import monthrange
+from datetime import date, datetime, timedelta
 from enum import IntEnum
 from typing import (
     Any,
     ClassVar,
+    Collection,
     Dict,
     Final,
     Hashable,
     Mapping,
     Optional,
+    Tuple,
     TypeVar,
     Union,
 )
 
 import voluptuous as vol
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_SERVICE,
     CONF_DESCRIPTION,
+    CONF_TYPE,
+    CONF_USERNAME,
     # STATE_LOCKED,
     STATE_OK,
     STATE_PROBLEM,
     STATE_UNKNOWN,
+    UnitOfTime,
 )
+
 STATE_LOCKED = "locked"
 
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.util import slugify
+from homeassistant.util import dt as dt_util, slugify
 
 from custom_components.lkcomu_interrao._base import (
     LkcomuInterRAOEntity,
     SupportedServicesType,
     make_common_async_setup_entry,
 )
-from custom_components.lkcomu_interrao._encoders import invoice_to_attrs, payment_to_attrs
-from custom_components.lkcomu_interrao._util import with_auto_auth
+from custom_components.lkcomu_interrao._encoders import (
+    invoice_to_attrs,
+    payment_to_attrs,
+)
+from custom_components.lkcomu_interrao._metrics import EntryMetrics
+from custom_components.lkcomu_interrao._util import (
+    IS_IN_RUSSIA,
+    async_cached_account_call,
+    async_record_call,
+    async_single_flight,
+    invalidate_account_cache,
+    mask_username,
+    single_flight_forget,
+    with_auto_auth,
+)
 from custom_components.lkcomu_interrao.const import (
     ATTR_ACCOUNT_CODE,
     ATTR_ACCOUNT_ID,
@@ -87,11 +111,17 @@ from custom_components.lkcomu_interrao.const import (
     ATTR_SUM,
     ATTR_TOTAL,
     ATTR_TOTAL_AREA,
+    CACHE_ENDPOINT_BALANCE,
+    CACHE_ENDPOINT_LAST_INVOICE,
+    CACHE_ENDPOINT_RELATED,
     CONF_ACCOUNTS,
     CONF_DEV_PRESENTATION,
+    CONF_DIAGNOSTIC_SENSORS,
     CONF_LAST_INVOICE,
     CONF_LOGOS,
     CONF_METERS,
+    DATA_API_STATES,
+    DATA_FINAL_CONFIG,
     DATA_PROVIDER_LOGOS,
     DOMAIN,
     FORMAT_VAR_ID,
@@ -132,19 +162,23 @@ INDICATIONS_SEQUENCE_SCHEMA = vol.All(
 
 CALCULATE_PUSH_INDICATIONS_SCHEMA = vol.All(
     cv.deprecated("notification"),
-    cv.make_entity_service_schema({
-        vol.Required(ATTR_INDICATIONS): vol.Any(
-            vol.All(
-                cv.string, lambda x: list(map(str.strip, x.split(","))), INDICATIONS_SEQUENCE_SCHEMA
+    cv.make_entity_service_schema(
+        {
+            vol.Required(ATTR_INDICATIONS): vol.Any(
+                vol.All(
+                    cv.string,
+                    lambda x: list(map(str.strip, x.split(","))),
+                    INDICATIONS_SEQUENCE_SCHEMA,
+                ),
+                INDICATIONS_MAPPING_SCHEMA,
+                INDICATIONS_SEQUENCE_SCHEMA,
             ),
-            INDICATIONS_MAPPING_SCHEMA,
-            INDICATIONS_SEQUENCE_SCHEMA,
-        ),
-        vol.Optional(ATTR_IGNORE_PERIOD, default=False): cv.boolean,
-        vol.Optional(ATTR_IGNORE_INDICATIONS, default=False): cv.boolean,
-        vol.Optional(ATTR_INCREMENTAL, default=False): cv.boolean,
-        vol.Optional("notification", default=None): lambda x: x,
-    })
+            vol.Optional(ATTR_IGNORE_PERIOD, default=False): cv.boolean,
+            vol.Optional(ATTR_IGNORE_INDICATIONS, default=False): cv.boolean,
+            vol.Optional(ATTR_INCREMENTAL, default=False): cv.boolean,
+            vol.Optional("notification", default=None): lambda x: x,
+        }
+    ),
 )
 
 SERVICE_PUSH_INDICATIONS: Final = "push_indications"
@@ -167,10 +201,94 @@ SERVICE_SET_DESCRIPTION: Final = "set_description"
 SERVICE_GET_PAYMENTS: Final = "get_payments"
 SERVICE_GET_INVOICES: Final = "get_invoices"
 
+METERS_RESULT_WINDOW: Final = 10.0  # seconds
+SUBMISSION_PERIOD_MARGIN: Final = timedelta(days=1)
+
+# Metric key: (name in English, name in Russian, icon, unit, state class)
+METRICS_SENSOR_TYPES: Final = {
+    "api_calls": (
+        "API calls",
+        "Запросы к API",
+        "mdi:api",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "api_errors": (
+        "API errors",
+        "Ошибки запросов к API",
+        "mdi:api-off",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "reauthentications": (
+        "Reauthentications",
+        "Повторные авторизации",
+        "mdi:account-key",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "refresh_duration": (
+        "Refresh duration",
+        "Длительность обновления",
+        "mdi:timer-outline",
+        UnitOfTime.SECONDS,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "entities_written": (
+        "Entities written",
+        "Записано объектов",
+        "mdi:content-save-outline",
+        None,
+        SensorStateClass.MEASUREMENT,
+    ),
+}
+
 _TLkcomuInterRAOEntity = TypeVar("_TLkcomuInterRAOEntity", bound=LkcomuInterRAOEntity)
 
 
-def get_supported_features(from_services: SupportedServicesType, for_object: Any) -> int:
+async def async_get_account_meters(
+    account: AbstractAccountWithMeters,
+) -> Mapping[str, AbstractMeter]:
+    """Retrieve account meters, sharing one request between concurrent callers"""
+    return await async_single_flight(
+        ("meters", account),
+        async_record_call,
+        account.api,
+        "meters",
+        account.async_get_meters,
+        result_window=METERS_RESULT_WINDOW,
+    )
+
+
+def get_next_submission_period(start_date: date, end_date: date) -> Tuple[date, date]:
+    """Shift a submission period to the following month, keeping its day numbers.
+
+    Days beyond the length of the following month are clamped to its last day, and
+    periods ending on the last day of a month keep ending on the last day.
+    """
+
+    def _next_month(value: date, to_month_end: bool) -> date:
+        year, month = (
+            (value.year + 1, 1) if value.month == 12 else (value.year, value.month + 1)
+        )
+        days_in_month = monthrange(year, month)[1]
+        return date(
+            year,
+            month,
+            days_in_month if to_month_end else min(value.day, days_in_month),
+        )
+
+    return (
+        _next_month(start_date, False),
+        _next_month(
+            end_date, end_date.day == monthrange(end_date.year, end_date.month)[1]
+        ),
+    )
+
+
+def get_supported_features(
+    from_services: SupportedServicesType, for_object: Any
+) -> int:
     features = 0
     for type_feature, services in from_services.items():
         if type_feature is None:
@@ -201,7 +319,9 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
         },
     }
 
-    def __init__(self, *args, balance: Optional[AbstractBalance] = None, **kwargs) -> None:
+    def __init__(
+        self, *args, balance: Optional[AbstractBalance] = None, **kwargs
+    ) -> None:
         super().__init__(*args, *kwargs)
         self._balance = balance
 
@@ -236,8 +356,7 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
     def device_class(self) -> Optional[str]:
         return DOMAIN + "_account"
 
-    @property
-    def unique_id(self) -> str:
+    def make_unique_id(self) -> str:
         """Return the unique ID of the sensor"""
         acc = self._account
         return f"{acc.api.__class__.__name__}_account_{acc.id}"
@@ -312,11 +431,16 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                     for zone_id, zone_def in zones.items():
                         attrs = ("name", "description", "tariff")
                         for prefix in ("", "within_"):
-                            values = tuple(getattr(zone_def, prefix + attr) for attr in attrs)
+                            values = tuple(
+                                getattr(zone_def, prefix + attr) for attr in attrs
+                            )
                             if any(values):
                                 attributes.update(
                                     zip(
-                                        map(lambda x: f"zone_{zone_id}_{prefix}{x}", attrs),
+                                        map(
+                                            lambda x: f"zone_{zone_id}_{prefix}{x}",
+                                            attrs,
+                                        ),
                                         values,
                                     )
                                 )
@@ -372,17 +496,21 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
             return [entity]
         else:
             if entity.enabled:
-                entity.async_schedule_update_ha_state(force_refresh=True)
+                await entity.async_update_ha_state_if_changed()
 
     async def async_update_internal(self) -> None:
-        await self._account.async_update_related()
         account = self._account
+        await async_cached_account_call(
+            account, CACHE_ENDPOINT_RELATED, account.async_update_related
+        )
 
         if isinstance(account, AbstractAccountWithBalance):
-            self._balance = await account.async_get_balance()
+            self._balance = await async_cached_account_call(
+                account, CACHE_ENDPOINT_BALANCE, account.async_get_balance
+            )
 
         if isinstance(account, AccountWithBytInfo):
-            await account.async_update_info()
+            await async_record_call(account.api, "info", account.async_update_info)
 
         self.register_supported_services(account)
 
@@ -400,7 +528,7 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
     async def async_service_get_payments(self, **call_data):
         account = self._account
 
-        _LOGGER.info(self.log_prefix + "Begin handling payments retrieval")
+        self.logger.info("Begin handling payments retrieval")
 
         if not isinstance(account, AbstractAccountWithPayments):
             raise ValueError("account does not support payments retrieval")
@@ -428,6 +556,7 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                 account.async_get_payments,
                 dt_start,
                 dt_end,
+                endpoint="get_payments",
             )
 
             for payment in payments:
@@ -447,12 +576,12 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                 event_data=event_data,
             )
 
-            _LOGGER.info(self.log_prefix + "Finish handling payments retrieval")
+            self.logger.info("Finish handling payments retrieval")
 
     async def async_service_get_invoices(self, **call_data):
         account = self._account
 
-        _LOGGER.info(self.log_prefix + "Begin handling invoices retrieval")
+        self.logger.info("Begin handling invoices retrieval")
 
         if not isinstance(account, AbstractAccountWithInvoices):
             raise ValueError("account does not support invoices retrieval")
@@ -480,6 +609,7 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                 account.async_get_invoices,
                 dt_start,
                 dt_end,
+                endpoint="get_invoices",
             )
 
             for invoice in invoices:
@@ -499,12 +629,12 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                 event_data=event_data,
             )
 
-            _LOGGER.info(self.log_prefix + "Finish handling invoices retrieval")
+            self.logger.info("Finish handling invoices retrieval")
 
     async def async_service_set_description(self, **call_data):
         account = self._account
 
-        _LOGGER.info(self.log_prefix + "Begin handling description setting")
+        self.logger.info("Begin handling description setting")
 
         event_data = {
             ATTR_ACCOUNT_CODE: account.code,
@@ -520,6 +650,7 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                 account.async_set_description,
                 description=event_data[ATTR_DESCRIPTION],
                 update=False,
+                endpoint="set_description",
             )
 
         except EnergosbytException as e:
@@ -534,6 +665,7 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
         else:
             event_data[ATTR_COMMENT] = "Successful calculation"
             event_data[ATTR_SUCCESS] = True
+            invalidate_account_cache(account, CACHE_ENDPOINT_RELATED)
             self.async_schedule_update_ha_state(force_refresh=True)
 
         finally:
@@ -542,13 +674,14 @@ class LkcomuAccount(LkcomuInterRAOEntity[Account]):
                 event_data=event_data,
             )
 
-            _LOGGER.info(self.log_prefix + "End handling indications calculation")
+            self.logger.info("End handling indications calculation")
 
 
 class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
     """The class for this sensor"""
 
     config_key: ClassVar[str] = CONF_METERS
+    date_dependent_attributes: ClassVar[bool] = True
 
     _supported_services: ClassVar[SupportedServicesType] = {
         (AbstractSubmittableMeter, FEATURE_PUSH_INDICATIONS): {
@@ -581,7 +714,7 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
     ):
         new_meter_entities = []
         if isinstance(account, AbstractAccountWithMeters):
-            meters = await account.async_get_meters()
+            meters = await async_get_account_meters(account)
 
             for meter_id, meter in meters.items():
                 entity_key = (account.id, meter_id)
@@ -597,14 +730,66 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
                     new_meter_entities.append(entity)
                 else:
                     if entity.enabled:
-                        entity.async_schedule_update_ha_state(force_refresh=True)
+                        await entity.async_update_ha_state_if_changed()
 
         return new_meter_entities if new_meter_entities else None
 
     async def async_update_internal(self) -> None:
-        meters = await self._account.async_get_meters()
+        # Meters of the account are shared between entities updated in the same
+        # group (or refresh), hence a single request is made for all of them
+        self._apply_meters(await async_get_account_meters(self._account))
+
+    @classmethod
+    def get_group_polling_hint(
+        cls,
+        entities: Collection["LkcomuMeter"],
+        now: datetime,
+    ) -> Tuple[bool, Optional[datetime]]:
+        """Poll densely only within submission periods (and margins around them).
+
+        Wake-ups are requested at margin and period boundaries, so that polling
+        switches modes exactly when indications may start or stop moving.
+        """
+        dense = False
+        boundaries = []
+
+        for entity in entities:
+            meter = entity._meter
+            if not isinstance(meter, AbstractSubmittableMeter):
+                return True, None
+
+            # Submission period is reported for the current month; the following
+            # month's period is considered as well, so that a wake-up is requested
+            # once the current period (along with its margin) has already passed.
+            period = meter.submission_period
+            for start_date, end_date in (period, get_next_submission_period(*period)):
+                dense_start, period_start, period_end, dense_end = map(
+                    dt_util.start_of_local_day,
+                    (
+                        start_date - SUBMISSION_PERIOD_MARGIN,
+                        start_date,
+                        end_date + timedelta(days=1),
+                        end_date + timedelta(days=1) + SUBMISSION_PERIOD_MARGIN,
+                    ),
+                )
+
+                if dense_start <= now < dense_end:
+                    dense = True
+
+                boundaries.extend(
+                    boundary
+                    for boundary in (dense_start, period_start, period_end, dense_end)
+                    if boundary > now
+                )
+
+        return dense, min(boundaries, default=None)
+
+    def _apply_meters(self, meters: Mapping[str, AbstractMeter]) -> None:
         meter = meters.get(self._meter.id)
         if meter is None:
+            snapshot = self.snapshot
+            if snapshot is not None:
+                snapshot.async_forget(self.unique_id)
             self.hass.async_create_task(self.async_remove())
         else:
             self.register_supported_services(meter)
@@ -619,8 +804,7 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
     def code(self) -> str:
         return self._meter.code
 
-    @property
-    def unique_id(self) -> str:
+    def make_unique_id(self) -> str:
         """Return the unique ID of the sensor"""
         met = self._meter
         acc = met.account
@@ -642,8 +826,9 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
     def supported_features(self) -> int:
         meter = self._meter
         return (
-                isinstance(meter, AbstractSubmittableMeter) * FEATURE_PUSH_INDICATIONS
-                | isinstance(meter, AbstractCalculatableMeter) * FEATURE_CALCULATE_INDICATIONS
+            isinstance(meter, AbstractSubmittableMeter) * FEATURE_PUSH_INDICATIONS
+            | isinstance(meter, AbstractCalculatableMeter)
+            * FEATURE_CALCULATE_INDICATIONS
         )
 
     @property
@@ -670,15 +855,15 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
             is_submittable = True  # this weird hack calms my IDE
 
             # noinspection PyUnresolvedReferences
-            today = date.today()
+            today = dt_util.now().date()
             start_date, end_date = met.submission_period
             attributes[ATTR_SUBMIT_PERIOD_START] = start_date.isoformat()
             attributes[ATTR_SUBMIT_PERIOD_END] = end_date.isoformat()
             attributes[ATTR_SUBMIT_PERIOD_ACTIVE] = start_date <= today <= end_date
 
-            if date.today() >= end_date:
+            if today >= end_date:
                 remaining_days = 0
-            elif date.today() >= start_date:
+            elif today >= start_date:
                 remaining_days = (end_date - today).days
             else:
                 remaining_days = (start_date - today).days
@@ -736,7 +921,11 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
     #################################################################################
 
     def _fire_callback_event(
-        self, call_data: Mapping[str, Any], event_data: Mapping[str, Any], event_id: str, title: str
+        self,
+        call_data: Mapping[str, Any],
+        event_data: Mapping[str, Any],
+        event_id: str,
+        title: str,
     ):
         meter = self._meter
         hass = self.hass
@@ -749,10 +938,11 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
             comment = "Response comment not provided"
             message = comment
 
-        _LOGGER.log(
-            logging.INFO if event_data.get(ATTR_SUCCESS) else logging.ERROR,
-            RE_MULTI_SPACES.sub(" ", RE_HTML_TAGS.sub("", comment)),
-        )
+        level = logging.INFO if event_data.get(ATTR_SUCCESS) else logging.ERROR
+        if _LOGGER.isEnabledFor(level):
+            _LOGGER.log(
+                level, "%s", RE_MULTI_SPACES.sub(" ", RE_HTML_TAGS.sub("", comment))
+            )
 
         meter_code = meter.code
 
@@ -766,11 +956,13 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
             **event_data,
         }
 
-        _LOGGER.debug("Firing event '%s' with post_fields: %s" % (event_id, event_data))
+        _LOGGER.debug("Firing event '%s' with post_fields: %s", event_id, event_data)
 
         hass.bus.async_fire(event_type=event_id, event_data=event_data)
 
-    def _get_real_indications(self, call_data: Mapping) -> Mapping[str, Union[int, float]]:
+    def _get_real_indications(
+        self, call_data: Mapping
+    ) -> Mapping[str, Union[int, float]]:
         indications: Mapping[str, Union[int, float]] = call_data[ATTR_INDICATIONS]
         meter_zones = self._meter.zones
 
@@ -781,12 +973,12 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
         if call_data[ATTR_INCREMENTAL]:
             return {
                 zone_id: (
-                        (
-                                meter_zones[zone_id].today_indication
-                                or meter_zones[zone_id].last_indication
-                                or 0
-                        )
-                        + new_value
+                    (
+                        meter_zones[zone_id].today_indication
+                        or meter_zones[zone_id].last_indication
+                        or 0
+                    )
+                    + new_value
                 )
                 for zone_id, new_value in indications.items()
             }
@@ -799,7 +991,7 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
         :param call_data: Parameters for service call
         :return:
         """
-        _LOGGER.info(self.log_prefix + "Begin handling indications submission")
+        self.logger.info("Begin handling indications submission")
 
         meter = self._meter
 
@@ -809,7 +1001,9 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
         meter_code = meter.code
 
         if not isinstance(meter, AbstractSubmittableMeter):
-            raise Exception("Meter '%s' does not support indications submission" % (meter_code,))
+            raise Exception(
+                "Meter '%s' does not support indications submission" % (meter_code,)
+            )
 
         else:
             event_data = {}
@@ -825,6 +1019,7 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
                     **indications,
                     ignore_periods=call_data[ATTR_IGNORE_PERIOD],
                     ignore_values=call_data[ATTR_IGNORE_INDICATIONS],
+                    endpoint="submit_indications",
                 )
 
             except EnergosbytException as e:
@@ -839,6 +1034,11 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
             else:
                 event_data[ATTR_COMMENT] = "Indications submitted successfully"
                 event_data[ATTR_SUCCESS] = True
+                single_flight_forget(("meters", self._account))
+                # Submitted indications may get accounted for in balance right away
+                invalidate_account_cache(
+                    self._account, CACHE_ENDPOINT_RELATED, CACHE_ENDPOINT_BALANCE
+                )
                 self.async_schedule_update_ha_state(force_refresh=True)
 
             finally:
@@ -849,7 +1049,7 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
                     "Передача показаний",
                 )
 
-                _LOGGER.info(self.log_prefix + "End handling indications submission")
+                self.logger.info("End handling indications submission")
 
     async def async_service_calculate_indications(self, **call_data):
         meter = self._meter
@@ -859,10 +1059,12 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
 
         meter_code = meter.code
 
-        _LOGGER.info(self.log_prefix + "Begin handling indications calculation")
+        self.logger.info("Begin handling indications calculation")
 
         if not isinstance(meter, AbstractCalculatableMeter):
-            raise Exception("Meter '%s' does not support indications calculation" % (meter_code,))
+            raise Exception(
+                "Meter '%s' does not support indications calculation" % (meter_code,)
+            )
 
         event_data = {ATTR_CHARGED: None, ATTR_SUCCESS: False}
 
@@ -877,6 +1079,7 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
                 **indications,
                 ignore_periods=call_data[ATTR_IGNORE_PERIOD],
                 ignore_values=call_data[ATTR_IGNORE_INDICATIONS],
+                endpoint="calculate_indications",
             )
 
         except EnergosbytException as e:
@@ -903,13 +1106,15 @@ class LkcomuMeter(LkcomuInterRAOEntity[AbstractAccountWithMeters]):
                 "Подсчёт показаний",
             )
 
-            _LOGGER.info(self.log_prefix + "End handling indications calculation")
+            self.logger.info("End handling indications calculation")
 
 
 class LkcomuLastInvoice(LkcomuInterRAOEntity[AbstractAccountWithInvoices]):
     config_key = CONF_LAST_INVOICE
 
-    def __init__(self, *args, last_invoice: Optional["AbstractInvoice"] = None, **kwargs) -> None:
+    def __init__(
+        self, *args, last_invoice: Optional["AbstractInvoice"] = None, **kwargs
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._last_invoice = last_invoice
 
@@ -925,8 +1130,7 @@ class LkcomuLastInvoice(LkcomuInterRAOEntity[AbstractAccountWithInvoices]):
     def device_class(self) -> Optional[str]:
         return DOMAIN + "_invoice"
 
-    @property
-    def unique_id(self) -> str:
+    def make_unique_id(self) -> str:
         """Return the unique ID of the sensor"""
         acc = self._account
         return f"{acc.api.__class__.__name__}_lastinvoice_{acc.id}"
@@ -1001,16 +1205,113 @@ class LkcomuLastInvoice(LkcomuInterRAOEntity[AbstractAccountWithInvoices]):
                 return [entity]
             else:
                 if entity.enabled:
-                    await entity.async_update_ha_state(force_refresh=True)
+                    await entity.async_update_ha_state_if_changed()
 
         return None
 
     async def async_update_internal(self) -> None:
-        self._last_invoice = await self._account.async_get_last_invoice()
+        account = self._account
+        self._last_invoice = await async_cached_account_call(
+            account, CACHE_ENDPOINT_LAST_INVOICE, account.async_get_last_invoice
+        )
 
 
-async_setup_entry = make_common_async_setup_entry(
+class LkcomuInterRAOMetricsSensor(SensorEntity):
+    """Diagnostic sensor presenting request and refresh metrics of a config entry"""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, config_entry: ConfigEntry, metrics: EntryMetrics, metric_key: str
+    ) -> None:
+        self._metrics = metrics
+        self._metric_key = metric_key
+
+        name_en, name_ru, icon, unit, state_class = METRICS_SENSOR_TYPES[metric_key]
+        username = mask_username(config_entry.data[CONF_USERNAME])
+        self._attr_name = f"{config_entry.data[CONF_TYPE]} {username} " + (
+            name_ru if IS_IN_RUSSIA else name_en
+        )
+        self._attr_unique_id = f"{config_entry.entry_id}_metrics_{metric_key}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self._metrics.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> Optional[Union[int, float]]:
+        metrics = self._metrics
+        metric_key = self._metric_key
+
+        if metric_key == "api_calls":
+            return metrics.calls
+        if metric_key == "api_errors":
+            return metrics.errors
+        if metric_key == "reauthentications":
+            return metrics.reauths
+
+        # Setup refreshes are followed by coordinator group updates; both count
+        cycle = metrics.cycles.get(metrics.last_cycle_kind)
+        if cycle is None:
+            return None
+        if metric_key == "refresh_duration":
+            return cycle.last_duration
+        if metric_key == "entities_written":
+            return cycle.last_entities_written
+        return None
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        metrics = self._metrics
+        metric_key = self._metric_key
+
+        if metric_key == "api_calls":
+            return {
+                endpoint: endpoint_metrics.calls
+                for endpoint, endpoint_metrics in metrics.endpoints.items()
+            }
+        if metric_key == "api_errors":
+            return {
+                endpoint: endpoint_metrics.errors
+                for endpoint, endpoint_metrics in metrics.endpoints.items()
+                if endpoint_metrics.errors
+            }
+        if metric_key == "reauthentications":
+            return {"failures": metrics.reauth_failures}
+
+        attributes = {"last_cycle": metrics.last_cycle_kind}
+        for kind, cycle in metrics.cycles.items():
+            attributes[f"{kind}_count"] = cycle.count
+            if metric_key == "refresh_duration":
+                mean = cycle.duration.mean
+                attributes[f"{kind}_mean"] = None if mean is None else round(mean, 3)
+                attributes[f"{kind}_max"] = round(cycle.duration.max, 3)
+            else:
+                attributes[f"{kind}_last"] = cycle.last_entities_written
+        return attributes
+
+
+_async_setup_account_entities = make_common_async_setup_entry(
     LkcomuAccount,
     LkcomuLastInvoice,
     LkcomuMeter,
 )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities
+):
+    await _async_setup_account_entities(hass, config_entry, async_add_entities)
+
+    entry_id = config_entry.entry_id
+    if hass.data[DATA_FINAL_CONFIG][entry_id][CONF_DIAGNOSTIC_SENSORS]:
+        metrics: EntryMetrics = hass.data[DATA_API_STATES][entry_id].metrics
+        async_add_entities(
+            LkcomuInterRAOMetricsSensor(config_entry, metrics, metric_key)
+            for metric_key in METRICS_SENSOR_TYPES
+        )